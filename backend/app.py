@@ -1,34 +1,214 @@
-from datetime import datetime, timedelta
+import asyncio
+import base64
+import calendar
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextvars import ContextVar
+import csv
+from datetime import date, datetime, timedelta
+from email.utils import formatdate, parsedate_to_datetime
 import enum
+import glob
+import gzip
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
 import os
+import re
+import secrets
+import selectors
 import shutil
-from typing import Any
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Iterable, Literal, NamedTuple
+from urllib.parse import quote
 from uuid import uuid4
 
-from fastapi import Depends, FastAPI, File, Form, HTTPException, UploadFile
-from fastapi.responses import FileResponse
+import anyio
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import APIRoute
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse, StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from pydantic import BaseModel, ConfigDict, EmailStr
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, Integer, JSON, String, Text, create_engine, select, or_, cast
-from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from multipart.multipart import MultipartParser, parse_options_header
+import orjson
+from PIL import Image, ImageOps
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Date,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    JSON,
+    String,
+    Text,
+    case,
+    cast,
+    create_engine,
+    delete,
+    event,
+    func,
+    insert,
+    literal,
+    literal_column,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Session, joinedload, relationship, selectinload, sessionmaker
+from sqlalchemy.pool import QueuePool
+from starlette.datastructures import MutableHeaders
+
+import letters
+import metrics
+import passwords
 
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql+psycopg2://rw_admin:rw_admin_password@db:5432/rw_admin")
+DB_MODE = os.getenv("DB_MODE", "sync")
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", DATABASE_URL.replace("+psycopg2", "+asyncpg"))
 JWT_SECRET = os.getenv("JWT_SECRET", "change_me")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 JWT_EXPIRES_MINUTES = int(os.getenv("JWT_EXPIRES_MINUTES", "60"))
 UPLOADS_DIR = os.getenv("UPLOADS_DIR", "/app/uploads")
 ANNOUNCEMENTS_DIR = os.path.join(UPLOADS_DIR, "announcements")
+LETTERS_DIR = os.path.join(UPLOADS_DIR, "letters")
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", os.path.join(UPLOADS_DIR, "archive"))
+BLOBS_DIRNAME = "blobs"
+FILE_OFFLOAD = os.getenv("FILE_OFFLOAD", "")
+NGINX_UPLOADS_LOCATION = os.getenv("NGINX_UPLOADS_LOCATION", "/_protected/uploads/")
+PRIVATE_FILE_CACHE_CONTROL = "private, no-cache"
+COVER_CACHE_CONTROL = "public, max-age=300"
+PASSWORD_HASH_SCHEME = os.getenv("PASSWORD_HASH_SCHEME", "bcrypt")
+PASSWORD_HASH_COST = os.getenv("PASSWORD_HASH_COST")
+PASSWORD_HASH_TARGET_MS = int(os.getenv("PASSWORD_HASH_TARGET_MS", "250"))
+HASH_POOL_SIZE = int(os.getenv("HASH_POOL_SIZE", "2"))
+HASH_QUEUE_LIMIT = int(os.getenv("HASH_QUEUE_LIMIT", "16"))
+EVENTS_CHANNEL = "submission_events"
+CACHE_CHANNEL = "cache_invalidations"
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "20"))
+SSE_MAX_CLIENTS = int(os.getenv("SSE_MAX_CLIENTS", "200"))
+SSE_QUEUE_SIZE = 100
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+JOB_LATENCY_WINDOW_MINUTES = 60
+LETTER_POOL_SIZE = int(os.getenv("LETTER_POOL_SIZE", "1"))
+LETTER_RENDER_TIMEOUT_SECONDS = float(os.getenv("LETTER_RENDER_TIMEOUT_SECONDS", "2"))
+LETTER_ORG_NAME = os.getenv("LETTER_ORG_NAME", "RW 01")
+LETTER_ORG_ADDRESS = os.getenv("LETTER_ORG_ADDRESS", "")
+LETTER_ORG_CITY = os.getenv("LETTER_ORG_CITY", "")
+LETTER_SIGNER_NAME = os.getenv("LETTER_SIGNER_NAME", "")
+SUBMISSION_FILE_MAX_BYTES = int(os.getenv("SUBMISSION_FILE_MAX_BYTES", str(10 * 1024 * 1024)))
+COVER_MAX_BYTES = 2 * 1024 * 1024
+UPLOAD_CHUNK_BYTES = 64 * 1024
+UPLOAD_FORM_OVERHEAD_BYTES = 64 * 1024
+MAGIC_SIGNATURES = [
+    (b"%PDF-", "application/pdf"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+]
+COVER_VARIANTS = {"thumb": (320, 180), "card": (640, 360), "full": (1280, 720)}
+COVER_FORMATS = {"webp": ("WEBP", "image/webp"), "jpeg": ("JPEG", "image/jpeg")}
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "1024"))
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+PUBLIC_CACHE_SIZE = int(os.getenv("PUBLIC_CACHE_SIZE", "256"))
+PUBLIC_CACHE_TTL_SECONDS = float(os.getenv("PUBLIC_CACHE_TTL_SECONDS", "30"))
+PUBLIC_CACHE_MAX_AGE = int(os.getenv("PUBLIC_CACHE_MAX_AGE", "60"))
+ADMIN_PAGE_SIZE_DEFAULT = 50
+ADMIN_PAGE_SIZE_MAX = 200
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+EXPORT_COLUMNS = [
+    "id",
+    "type",
+    "status",
+    "created_at",
+    "updated_at",
+    "user_id",
+    "owner_email",
+    "owner_full_name",
+    "owner_phone_number",
+    "owner_nik",
+    "owner_kk_number",
+    "payload",
+]
+BULK_ACTION_MAX_ITEMS = 200
+SEARCH_CONFIG = literal_column("'simple'::regconfig")
+DECISION_TIME_BUCKETS_HOURS = (1, 4, 8, 24, 48, 72, 120, 168, 336, 720)
+ROLLUP_LOCK_ID = 814001
+PARTITION_LOCK_ID = 814003
+APPROVAL_LOG_PARTITIONS_AHEAD = 3
+APPROVAL_LOG_RETENTION_MONTHS = int(os.getenv("APPROVAL_LOG_RETENTION_MONTHS", "36"))
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+REQUEST_DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+UPLOAD_DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SQL_REPEAT_THRESHOLD = int(os.getenv("SQL_REPEAT_THRESHOLD", "3"))
+SQL_LOG_PARAMS_CHARS = 500
+ACCESS_LOG_TOKEN_PATTERN = re.compile(r"([?&]token=)[^&]*")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", "100"))
+DB_RESERVED_CONNECTIONS = int(os.getenv("DB_RESERVED_CONNECTIONS", "20"))
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+JSON_ENCODER = os.getenv("JSON_ENCODER", "stdlib")
+
+if DB_MODE not in ("sync", "async"):
+    raise RuntimeError(f"Unsupported DB_MODE: {DB_MODE}")
+if JSON_ENCODER not in ("stdlib", "orjson"):
+    raise RuntimeError(f"Unsupported JSON_ENCODER: {JSON_ENCODER}")
+
+
+def db_pool_sizes() -> tuple[int, int]:
+    # Split what Postgres allows (minus connections kept for the job worker, migrations and psql) across
+    # every pool of every serving process, so workers * (pool_size + max_overflow) never exceeds it.
+    pools = 2 if DB_MODE == "async" else 1
+    # One more per process for the LISTEN connection behind /api/events, which lives outside the pools.
+    budget = (DB_MAX_CONNECTIONS - DB_RESERVED_CONNECTIONS) // WEB_CONCURRENCY - 1
+    budget //= pools
+    if budget < 1:
+        raise RuntimeError(
+            f"DB_MAX_CONNECTIONS={DB_MAX_CONNECTIONS} leaves no connections for {WEB_CONCURRENCY} workers"
+        )
+    pool_size = min(DB_POOL_SIZE, budget)
+    return pool_size, min(DB_MAX_OVERFLOW, budget - pool_size)
+
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+db_pool_size, db_max_overflow = db_pool_sizes()
+engine = create_engine(DATABASE_URL, pool_pre_ping=True, pool_size=db_pool_size, max_overflow=db_max_overflow)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
+async_engine = (
+    create_async_engine(
+        ASYNC_DATABASE_URL, pool_pre_ping=True, pool_size=db_pool_size, max_overflow=db_max_overflow
+    )
+    if DB_MODE == "async"
+    else None
+)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 
 class Base(DeclarativeBase):
     pass
 
 
+def search_vector(column):
+    return func.to_tsvector(SEARCH_CONFIG, column)
+
+
 class RoleEnum(str, enum.Enum):
     WARGA = "WARGA"
     ADMIN_RW = "ADMIN_RW"
@@ -55,6 +235,13 @@ class AnnouncementStatusEnum(str, enum.Enum):
     ARCHIVED = "ARCHIVED"
 
 
+class JobStatusEnum(str, enum.Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -78,9 +265,19 @@ class Submission(Base):
     type = Column(String(100), nullable=False)
     payload = Column(JSON, nullable=False)
     status = Column(Enum(SubmissionStatusEnum), nullable=False, default=SubmissionStatusEnum.SUBMITTED)
+    search_text = Column(Text, nullable=False, default="", server_default="")
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    owner = relationship("User")
+    files = relationship("SubmissionFile", back_populates="submission", order_by="SubmissionFile.id")
+    logs = relationship("ApprovalLog", back_populates="submission", order_by="ApprovalLog.created_at.desc()")
+
+    __table_args__ = (
+        Index("ix_submissions_created_at_id", "created_at", "id"),
+        Index("ix_submissions_search", search_vector(search_text), postgresql_using="gin"),
+    )
+
 
 class SubmissionFile(Base):
     __tablename__ = "submission_files"
@@ -89,21 +286,67 @@ class SubmissionFile(Base):
     submission_id = Column(Integer, ForeignKey("submissions.id"), nullable=False, index=True)
     document_type = Column(String(120), nullable=False)
     original_name = Column(String(255), nullable=False)
-    stored_name = Column(String(255), nullable=False, unique=True)
+    stored_name = Column(String(255), nullable=False)
     mime_type = Column(String(255), nullable=False)
     size_bytes = Column(Integer, nullable=False)
+    blob_sha256 = Column(String(64), ForeignKey("blobs.sha256"), nullable=True, index=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    submission = relationship("Submission", back_populates="files")
+
+
+class SubmissionCounter(Base):
+    __tablename__ = "submission_counters"
+
+    type = Column(String(100), primary_key=True)
+    status = Column(Enum(SubmissionStatusEnum), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class DailyRollup(Base):
+    __tablename__ = "daily_rollups"
+
+    day = Column(Date, primary_key=True)
+    metric = Column(String(40), primary_key=True)
+    dimension = Column(String(120), primary_key=True)
+    value = Column(BigInteger, nullable=False)
+
+
+class RollupWatermark(Base):
+    __tablename__ = "rollup_watermarks"
+
+    name = Column(String(40), primary_key=True)
+    rolled_through = Column(Date, nullable=False)
+
+
+class Blob(Base):
+    __tablename__ = "blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    stored_name = Column(String(255), nullable=False)
+    size_bytes = Column(Integer, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
 
 
 class ApprovalLog(Base):
     __tablename__ = "approval_logs"
 
-    id = Column(Integer, primary_key=True)
-    submission_id = Column(Integer, ForeignKey("submissions.id"), nullable=False, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    submission_id = Column(Integer, ForeignKey("submissions.id"), nullable=False)
     actor_user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     action = Column(Enum(SubmissionActionEnum), nullable=False)
     note = Column(Text, nullable=True)
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow)
+
+    submission = relationship("Submission", back_populates="logs")
+
+    # Monthly partitions (approval_logs_pYYYYMM plus approval_logs_default) are managed by
+    # ensure_approval_log_partitions; the primary key has to include the partition key.
+    __table_args__ = (
+        Index("ix_approval_logs_submission_id_created_at", "submission_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
 
 class Announcement(Base):
@@ -123,12 +366,335 @@ class Announcement(Base):
     cover_focus = Column(String(32), nullable=False, default="center")
     author_user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     published_at = Column(DateTime, nullable=True)
+    search_text = Column(Text, nullable=False, default="", server_default="")
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    author = relationship("User")
+
+    __table_args__ = (Index("ix_announcements_search", search_vector(search_text), postgresql_using="gin"),)
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(60), nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(Enum(JobStatusEnum), nullable=False, default=JobStatusEnum.QUEUED)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=JOB_MAX_ATTEMPTS)
+    run_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    locked_by = Column(String(120), nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_jobs_claim", "kind", "run_at", postgresql_where=text("status = 'QUEUED'")),
+        Index("ix_jobs_status_finished_at", "status", "finished_at"),
+    )
+
+
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._items: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Any | None:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None or item[0] < time.monotonic():
+                self._items.pop(key, None)
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self._items[key] = (time.monotonic() + self.ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def invalidate(self, key: Any) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"size": len(self._items), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+class EventBroker:
+    # Fans NOTIFY payloads from the listener thread out to the SSE queues of this process;
+    # the same thread applies cache invalidations sent by the other workers.
+    def __init__(self, max_clients: int, queue_size: int):
+        self.max_clients = max_clients
+        self.queue_size = queue_size
+        self.subscribers: dict[str, set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self.clients = 0
+        self.listener: threading.Thread | None = None
+        self.lock = threading.Lock()
+
+    def full(self) -> bool:
+        with self.lock:
+            return self.clients >= self.max_clients
+
+    def start_listener(self) -> None:
+        with self.lock:
+            if self.listener is None:
+                self.listener = threading.Thread(target=listen_for_events, args=(self,), name="events", daemon=True)
+                self.listener.start()
+
+    def subscribe(self, key: str) -> asyncio.Queue | None:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        with self.lock:
+            if self.clients >= self.max_clients:
+                return None
+            self.subscribers.setdefault(key, set()).add((asyncio.get_running_loop(), queue))
+            self.clients += 1
+        self.start_listener()
+        return queue
+
+    def unsubscribe(self, key: str, queue: asyncio.Queue) -> None:
+        with self.lock:
+            subscribers = self.subscribers.get(key, set())
+            for subscriber in [item for item in subscribers if item[1] is queue]:
+                subscribers.discard(subscriber)
+                self.clients -= 1
+            if not subscribers:
+                self.subscribers.pop(key, None)
+
+    def publish(self, event: dict[str, Any]) -> None:
+        with self.lock:
+            targets = [
+                subscriber
+                for key in ("admin", f"user:{event.get('user_id')}")
+                for subscriber in self.subscribers.get(key, ())
+            ]
+        for loop, queue in targets:
+            loop.call_soon_threadsafe(self.deliver, queue, event)
+
+    @staticmethod
+    def deliver(queue: asyncio.Queue, event: dict[str, Any]) -> None:
+        # A client that stops reading loses events rather than holding memory; it resyncs on reconnect.
+        if not queue.full():
+            queue.put_nowait(event)
+
+    def stats(self) -> dict[str, Any]:
+        with self.lock:
+            return {"clients": self.clients, "channels": len(self.subscribers), "max_clients": self.max_clients}
+
+
+class CachedJSON(NamedTuple):
+    body: bytes
+    etag: str
+
+
+class JobHandler(NamedTuple):
+    fn: Callable[[Session, dict[str, Any]], None]
+    concurrency: int
+
+
+class IngestedUpload(NamedTuple):
+    stored_name: str
+    size_bytes: int
+    sha256: str
+    mime_type: str
+
+
+class StoredFileResponse(FileResponse):
+    def _should_use_range(self, http_if_range: str, stat_result: os.stat_result) -> bool:
+        return http_if_range in (self.headers.get("etag"), self.headers.get("last-modified"))
+
+
+class UploadSizeLimitMiddleware:
+    limits = [
+        (re.compile(r"^/api/submissions/\d+/files$"), SUBMISSION_FILE_MAX_BYTES),
+        (re.compile(r"^/api/admin/announcements/\d+/cover$"), COVER_MAX_BYTES),
+    ]
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST":
+            return await self.app(scope, receive, send)
+        limit = next((limit for pattern, limit in self.limits if pattern.match(scope["path"])), None)
+        if limit is None:
+            return await self.app(scope, receive, send)
+
+        max_body = limit + UPLOAD_FORM_OVERHEAD_BYTES
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > max_body:
+            response = JSONResponse({"detail": "Upload too large"}, status_code=413)
+            return await response(scope, receive, send)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_body:
+                    raise HTTPException(status_code=413, detail="Upload too large")
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+class AccessLogTokenFilter(logging.Filter):
+    # /api/events takes the JWT as ?token=; uvicorn's access log (also used under gunicorn) prints the full path.
+    def filter(self, record: logging.LogRecord) -> bool:
+        if isinstance(record.args, tuple) and len(record.args) > 2 and isinstance(record.args[2], str):
+            args = list(record.args)
+            args[2] = ACCESS_LOG_TOKEN_PATTERN.sub(r"\1[redacted]", args[2])
+            record.args = tuple(args)
+        return True
+
+
+class RequestQueryStats:
+    def __init__(self, scope):
+        self.scope = scope
+        self.started = time.perf_counter()
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: dict[str, int] = {}
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] = self.statements.get(statement, 0) + 1
+
+    def route(self) -> str:
+        route = self.scope.get("route")
+        return f"{self.scope['method']} {route.path if route else self.scope['path']}"
+
+    def server_timing(self) -> str:
+        total_ms = (time.perf_counter() - self.started) * 1000
+        return f'db;dur={self.seconds * 1000:.1f};desc="queries: {self.count}", app;dur={total_ms:.1f}'
+
+    def report(self) -> None:
+        if SQL_REPEAT_THRESHOLD <= 0:
+            return
+        for statement, count in self.statements.items():
+            if count >= SQL_REPEAT_THRESHOLD:
+                sql_logger.warning("possible N+1 on %s: %s x %s", self.route(), count, " ".join(statement.split()))
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        # Sync endpoints run on the threadpool with a copy of this context, so they share the stats object.
+        stats = RequestQueryStats(scope)
+        token = request_query_stats.set(stats)
+
+        async def timing_send(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, timing_send)
+        finally:
+            request_query_stats.reset(token)
+            stats.report()
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        method = scope["method"]
+        status = 500
+
+        async def recording_send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, recording_send)
+        finally:
+            http_requests_in_flight.dec(method)
+            # The route template (set by the router) keeps label cardinality bounded.
+            route = scope.get("route")
+            http_request_duration.observe(
+                method, route.path if route else "unmatched", str(status), value=time.perf_counter() - started
+            )
+
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer(auto_error=False)
+principal_cache = TTLCache(PRINCIPAL_CACHE_SIZE, PRINCIPAL_CACHE_TTL_SECONDS)
+public_cache = TTLCache(PUBLIC_CACHE_SIZE, PUBLIC_CACHE_TTL_SECONDS)
+public_cache_version = 0
+password_hash_cost = int(PASSWORD_HASH_COST) if PASSWORD_HASH_COST else None
+hash_pool: ProcessPoolExecutor | None = None
+hash_pool_lock = threading.Lock()
+hash_slots = threading.BoundedSemaphore(HASH_QUEUE_LIMIT)
+letter_pool: ProcessPoolExecutor | None = None
+letter_pool_lock = threading.Lock()
+letter_renders: dict[str, Future] = {}
+event_broker = EventBroker(SSE_MAX_CLIENTS, SSE_QUEUE_SIZE)
+letter_renders_lock = threading.RLock()
+job_handlers: dict[str, JobHandler] = {}
+request_query_stats: ContextVar[RequestQueryStats | None] = ContextVar("request_query_stats", default=None)
+sql_logger = logging.getLogger("app.sql")
+metrics_logger = logging.getLogger("app.metrics")
+logging.getLogger("uvicorn.access").addFilter(AccessLogTokenFilter())
+
+metrics_registry = metrics.Registry(METRICS_DIR)
+metrics_flush_task: asyncio.Task | None = None
+http_request_duration = metrics_registry.histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template and status.",
+    ("method", "route", "status"),
+    REQUEST_DURATION_BUCKETS,
+)
+http_requests_in_flight = metrics_registry.gauge(
+    "http_requests_in_flight", "Requests currently being served.", ("method",)
+)
+db_pool_checkouts = metrics_registry.counter("db_pool_checkouts", "Connections checked out of the pool.", ("engine",))
+db_pool_connections = metrics_registry.gauge(
+    "db_pool_connections", "Pool connections by state (size, checked_in, checked_out, overflow).", ("engine", "state")
+)
+threadpool_tokens = metrics_registry.gauge(
+    "threadpool_tokens", "Worker threadpool capacity and use (total, borrowed, waiting).", ("state",)
+)
+upload_bytes = metrics_registry.counter("upload_bytes", "Bytes stored from uploads.", ("kind",))
+upload_duration = metrics_registry.histogram(
+    "upload_duration_seconds", "Time to stream and store an upload.", ("kind",), UPLOAD_DURATION_BUCKETS
+)
+uploads_disk_bytes = metrics_registry.gauge(
+    "uploads_disk_bytes", "Disk space on UPLOADS_DIR (free, total).", ("state",), aggregate="max"
+)
+event_stream_clients = metrics_registry.gauge("event_stream_clients", "Open server-sent event streams.")
 
 
 class RegisterRequest(BaseModel):
@@ -174,6 +740,12 @@ class SubmissionActionRequest(BaseModel):
     note: str | None = None
 
 
+class BulkSubmissionActionRequest(BaseModel):
+    submission_ids: list[int] = Field(min_length=1, max_length=BULK_ACTION_MAX_ITEMS)
+    action: SubmissionActionEnum
+    note: str | None = None
+
+
 class SubmissionResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -230,6 +802,11 @@ class AdminSubmissionListItem(BaseModel):
     updated_at: datetime
 
 
+class AdminSubmissionPage(BaseModel):
+    items: list[AdminSubmissionListItem]
+    next_cursor: str | None = None
+
+
 class AdminSubmissionDetailResponse(SubmissionResponse):
     owner_email: EmailStr
     owner_full_name: str | None
@@ -240,11 +817,59 @@ class AdminSubmissionDetailResponse(SubmissionResponse):
     logs: list[ApprovalLogResponse]
 
 
+class SubmissionStatsResponse(BaseModel):
+    total: int
+    by_status: dict[SubmissionStatusEnum, int]
+    by_type: dict[str, dict[SubmissionStatusEnum, int]]
+
+
+class AdminDecisionReport(BaseModel):
+    actor_user_id: int
+    full_name: str | None
+    approved: int
+    rejected: int
+
+
+class DecisionTimeReport(BaseModel):
+    decisions: int
+    mean_hours: float | None
+    p50_hours: float | None
+    p90_hours: float | None
+    p95_hours: float | None
+    histogram: dict[str, int]
+
+
+class ReportResponse(BaseModel):
+    period: str
+    date_from: date
+    date_to: date
+    rolled_through: date | None
+    submissions_total: int
+    submissions_by_type: dict[str, int]
+    decisions_by_admin: list[AdminDecisionReport]
+    time_to_decision: DecisionTimeReport
+
+
 class SubmissionActionResponse(BaseModel):
     submission: SubmissionResponse
     log: ApprovalLogResponse
 
 
+class BulkSubmissionActionResult(BaseModel):
+    submission_id: int
+    ok: bool
+    previous_status: SubmissionStatusEnum | None = None
+    log_id: int | None = None
+    detail: str | None = None
+
+
+class BulkSubmissionActionResponse(BaseModel):
+    action: SubmissionActionEnum
+    status: SubmissionStatusEnum
+    updated: int
+    results: list[BulkSubmissionActionResult]
+
+
 class AnnouncementCreateRequest(BaseModel):
     title: str
     excerpt: str | None = None
@@ -276,6 +901,7 @@ class AnnouncementResponse(BaseModel):
     content: str | None
     status: AnnouncementStatusEnum
     cover_url: str | None = None
+    cover_urls: dict[str, str] | None = None
     cover_name: str | None = None
     cover_focus: str | None = None
     author_name: str | None = None
@@ -294,6 +920,7 @@ class AnnouncementListItem(BaseModel):
     category: str | None
     status: AnnouncementStatusEnum
     cover_url: str | None = None
+    cover_urls: dict[str, str] | None = None
     cover_focus: str | None = None
     author_name: str | None = None
     published_at: datetime | None
@@ -302,6 +929,9 @@ class AnnouncementListItem(BaseModel):
 
 
 app = FastAPI(title="RW Admin API")
+app.add_middleware(UploadSizeLimitMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(QueryStatsMiddleware)
 
 
 def get_db():
@@ -312,12 +942,75 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def calibrate_password_hash_cost() -> int:
+    global password_hash_cost
+    with hash_pool_lock:
+        if password_hash_cost is None:
+            password_hash_cost = passwords.calibrate_cost(PASSWORD_HASH_SCHEME, PASSWORD_HASH_TARGET_MS)
+    return password_hash_cost
+
+
+def get_hash_pool() -> ProcessPoolExecutor:
+    global hash_pool
+    calibrate_password_hash_cost()
+    with hash_pool_lock:
+        if hash_pool is None:
+            hash_pool = ProcessPoolExecutor(
+                max_workers=HASH_POOL_SIZE, mp_context=multiprocessing.get_context("spawn")
+            )
+    return hash_pool
+
+
+def shutdown_hash_pool() -> None:
+    global hash_pool
+    with hash_pool_lock:
+        if hash_pool is not None:
+            hash_pool.shutdown(wait=False, cancel_futures=True)
+            hash_pool = None
+
+
+def submit_password_job(fn, *args) -> Future:
+    pool = get_hash_pool()
+    if not hash_slots.acquire(blocking=False):
+        raise HTTPException(status_code=503, detail="Server busy, try again", headers={"Retry-After": "1"})
+    try:
+        future = pool.submit(fn, *args, PASSWORD_HASH_SCHEME, password_hash_cost)
+    except Exception:
+        hash_slots.release()
+        raise
+    future.add_done_callback(lambda _: hash_slots.release())
+    return future
+
+
+def get_letter_pool() -> ProcessPoolExecutor:
+    global letter_pool
+    with letter_pool_lock:
+        if letter_pool is None:
+            letter_pool = ProcessPoolExecutor(
+                max_workers=LETTER_POOL_SIZE, mp_context=multiprocessing.get_context("spawn")
+            )
+    return letter_pool
+
+
+def shutdown_letter_pool() -> None:
+    global letter_pool
+    with letter_pool_lock:
+        if letter_pool is not None:
+            letter_pool.shutdown(wait=False, cancel_futures=True)
+            letter_pool = None
+
+
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return submit_password_job(passwords.hash_password, password).result()
 
 
-def verify_password(password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(password, hashed_password)
+def verify_and_update_password(password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return submit_password_job(passwords.verify_and_update, password, hashed_password).result()
 
 
 def create_access_token(user_id: int) -> str:
@@ -326,24 +1019,86 @@ def create_access_token(user_id: int) -> str:
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-) -> User:
+def decode_access_token(credentials: HTTPAuthorizationCredentials | None) -> int:
     if not credentials:
         raise HTTPException(status_code=401, detail="Missing token")
 
     token = credentials.credentials
     try:
         payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        user_id = int(payload.get("sub", "0"))
+        return int(payload.get("sub", "0"))
     except (JWTError, ValueError):
         raise HTTPException(status_code=401, detail="Invalid token")
 
+
+def snapshot_user(user: User) -> User:
+    return User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+
+
+def cache_principal(user: User) -> User:
+    principal = snapshot_user(user)
+    principal_cache.set(principal.id, principal)
+    return principal
+
+
+def notify_cache_invalidations(connection, messages: list[dict[str, Any]]) -> None:
+    # Sent inside the flushing transaction, so other workers only drop entries once the change commits.
+    connection.execute(
+        text("SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload"),
+        {"channel": CACHE_CHANNEL, "payloads": [json.dumps(message) for message in messages]},
+    )
+
+
+def apply_cache_invalidation(message: dict[str, Any]) -> None:
+    if message["cache"] == "principal":
+        principal_cache.invalidate(message["id"])
+    elif message["cache"] == "public":
+        invalidate_public_cache()
+
+
+def clear_shared_caches() -> None:
+    principal_cache.clear()
+    invalidate_public_cache()
+
+
+@event.listens_for(Session, "after_flush")
+def collect_cache_invalidations(session: Session, flush_context) -> None:
+    pending = session.info.setdefault("cache_invalidations", [])
+    changed = [*session.dirty, *session.deleted]
+    messages = [{"cache": "principal", "id": obj.id} for obj in changed if isinstance(obj, User)]
+    if any(isinstance(obj, Announcement) for obj in [*session.new, *changed]):
+        messages.append({"cache": "public"})
+    messages = [message for message in messages if message not in pending]
+    if messages:
+        notify_cache_invalidations(session.connection(), messages)
+        pending.extend(messages)
+
+
+@event.listens_for(Session, "after_commit")
+def apply_committed_invalidations(session: Session) -> None:
+    # This worker drops its entries right away; the others do when the NOTIFY reaches their listener.
+    for message in session.info.pop("cache_invalidations", ()):
+        apply_cache_invalidation(message)
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_cache_invalidations(session: Session) -> None:
+    session.info.pop("cache_invalidations", None)
+
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db),
+) -> User:
+    user_id = decode_access_token(credentials)
+    principal = principal_cache.get(user_id)
+    if principal:
+        return principal
+
     user = db.scalar(select(User).where(User.id == user_id))
     if not user:
         raise HTTPException(status_code=401, detail="Invalid token")
-    return user
+    return cache_principal(user)
 
 
 def require_admin(current_user: User) -> None:
@@ -359,6 +1114,877 @@ def ensure_announcements_dir() -> None:
     os.makedirs(ANNOUNCEMENTS_DIR, exist_ok=True)
 
 
+def ensure_letters_dir() -> None:
+    os.makedirs(LETTERS_DIR, exist_ok=True)
+
+
+def content_disposition(filename: str) -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+def stored_file_etag(path: str, stat_result: os.stat_result, content_hash: str | None = None) -> str:
+    if content_hash:
+        return f'"{content_hash[:32]}"'
+    basis = f"{os.path.basename(path)}-{stat_result.st_size}-{stat_result.st_mtime}"
+    return f'"{hashlib.md5(basis.encode(), usedforsecurity=False).hexdigest()}"'
+
+
+def is_not_modified(request: Request, etag: str, stat_result: os.stat_result) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since:
+        return False
+    try:
+        return int(stat_result.st_mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+
+def stored_file_response(
+    request: Request,
+    path: str,
+    media_type: str,
+    filename: str | None = None,
+    headers: dict[str, str] | None = None,
+    content_hash: str | None = None,
+    cache_control: str = PRIVATE_FILE_CACHE_CONTROL,
+) -> Response:
+    stat_result = os.stat(path)
+    etag = stored_file_etag(path, stat_result, content_hash)
+    response_headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "Cache-Control": cache_control,
+        **(headers or {}),
+    }
+    if is_not_modified(request, etag, stat_result):
+        return Response(status_code=304, headers=response_headers)
+
+    if FILE_OFFLOAD != "nginx":
+        return StoredFileResponse(
+            path, media_type=media_type, filename=filename, headers=response_headers, stat_result=stat_result
+        )
+
+    response_headers["X-Accel-Redirect"] = NGINX_UPLOADS_LOCATION + quote(os.path.relpath(path, UPLOADS_DIR))
+    if filename:
+        response_headers["Content-Disposition"] = content_disposition(filename)
+    return Response(media_type=media_type, headers=response_headers)
+
+
+def sniff_mime_type(head: bytes) -> str | None:
+    for signature, mime_type in MAGIC_SIGNATURES:
+        if head.startswith(signature):
+            return mime_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head[4:12] in (b"ftypheic", b"ftypheix", b"ftypmif1"):
+        return "image/heic"
+    return None
+
+
+def blob_stored_name(sha256: str) -> str:
+    return os.path.join(BLOBS_DIRNAME, sha256[:2], sha256)
+
+
+class UploadWriter:
+    # One pass over the upload: size limit, SHA-256 and MIME sniffing while writing the temp file.
+    def __init__(self, dest_dir: str, filename: str, content_type: str | None, max_bytes: int, too_large_detail: str):
+        self.started = time.perf_counter()
+        self.dest_dir = dest_dir
+        self.stored_name = f"{uuid4().hex}{os.path.splitext(filename)[1]}"
+        self.content_type = content_type or "application/octet-stream"
+        self.max_bytes = max_bytes
+        self.too_large_detail = too_large_detail
+        self.digest = hashlib.sha256()
+        self.size_bytes = 0
+        self.mime_type: str | None = None
+        self.buffer = None
+        self.temp_path: str | None = None
+
+    def open(self) -> None:
+        fd, self.temp_path = tempfile.mkstemp(dir=self.dest_dir, suffix=".part")
+        os.fchmod(fd, letters.SERVED_FILE_MODE)
+        self.buffer = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        if self.buffer is None:
+            self.open()
+        if self.mime_type is None:
+            self.mime_type = sniff_mime_type(chunk) or self.content_type
+        self.size_bytes += len(chunk)
+        if self.size_bytes > self.max_bytes:
+            raise HTTPException(status_code=413, detail=self.too_large_detail)
+        self.digest.update(chunk)
+        self.buffer.write(chunk)
+
+    def finish(self, kind: str, content_addressed: bool = False) -> IngestedUpload:
+        if self.buffer is None:
+            self.open()
+        self.buffer.close()
+        stored_name = blob_stored_name(self.digest.hexdigest()) if content_addressed else self.stored_name
+        stored_path = os.path.join(self.dest_dir, stored_name)
+        if content_addressed and os.path.exists(stored_path):
+            os.remove(self.temp_path)
+        else:
+            os.makedirs(os.path.dirname(stored_path), exist_ok=True)
+            os.replace(self.temp_path, stored_path)
+        self.temp_path = None
+
+        upload_bytes.inc(kind, amount=self.size_bytes)
+        upload_duration.observe(kind, value=time.perf_counter() - self.started)
+        return IngestedUpload(
+            stored_name=stored_name,
+            size_bytes=self.size_bytes,
+            sha256=self.digest.hexdigest(),
+            mime_type=self.mime_type or self.content_type,
+        )
+
+    def abort(self) -> None:
+        if self.buffer is not None:
+            self.buffer.close()
+        if self.temp_path and os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+
+class MultipartUploadReader:
+    # Parses the multipart body as it arrives and feeds the "file" part straight into an
+    # UploadWriter. Declaring UploadFile would make Starlette spool the whole upload to a
+    # temp file first, writing every byte to disk twice.
+    def __init__(
+        self,
+        dest_dir: str,
+        max_bytes: int,
+        too_large_detail: str,
+        content_type_prefix: str = "",
+        content_type_detail: str = "Unsupported file type",
+    ):
+        self.dest_dir = dest_dir
+        self.max_bytes = max_bytes
+        self.too_large_detail = too_large_detail
+        self.content_type_prefix = content_type_prefix
+        self.content_type_detail = content_type_detail
+        self.fields: dict[str, str] = {}
+        self.filename: str | None = None
+        self.writer: UploadWriter | None = None
+        self.pending: list[bytes] = []
+        self.headers: dict[bytes, bytes] = {}
+        self.header_field = b""
+        self.header_value = b""
+        self.part_name = ""
+        self.part_value = b""
+        self.in_file = False
+
+    def on_part_begin(self) -> None:
+        self.headers = {}
+        self.part_name = ""
+        self.part_value = b""
+        self.in_file = False
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self.header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self.header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self.headers[self.header_field.lower()] = self.header_value
+        self.header_field = b""
+        self.header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self.headers.get(b"content-disposition", b""))
+        self.part_name = options.get(b"name", b"").decode("utf-8", errors="replace")
+        if b"filename" not in options:
+            return
+        if self.part_name != "file" or self.writer is not None:
+            raise HTTPException(status_code=422, detail="Only one file field named 'file' is accepted")
+        content_type = self.headers.get(b"content-type", b"").decode("latin-1")
+        if not content_type.startswith(self.content_type_prefix):
+            raise HTTPException(status_code=400, detail=self.content_type_detail)
+        self.filename = options[b"filename"].decode("utf-8", errors="replace")
+        self.writer = UploadWriter(self.dest_dir, self.filename, content_type, self.max_bytes, self.too_large_detail)
+        self.in_file = True
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self.in_file:
+            self.pending.append(data[start:end])
+        else:
+            self.part_value += data[start:end]
+
+    def on_part_end(self) -> None:
+        if not self.in_file:
+            self.fields[self.part_name] = self.part_value.decode("utf-8", errors="replace")
+
+    async def ingest(
+        self, request: Request, kind: str, required_fields: tuple[str, ...] = (), content_addressed: bool = False
+    ) -> IngestedUpload:
+        content_type, params = parse_options_header(request.headers.get("content-type", ""))
+        if content_type != b"multipart/form-data" or not params.get(b"boundary"):
+            raise HTTPException(status_code=422, detail="Expected multipart/form-data")
+        callbacks = {
+            name: getattr(self, name)
+            for name in (
+                "on_part_begin",
+                "on_part_data",
+                "on_part_end",
+                "on_header_field",
+                "on_header_value",
+                "on_header_end",
+                "on_headers_finished",
+            )
+        }
+        parser = MultipartParser(params[b"boundary"], callbacks)
+        try:
+            async for chunk in request.stream():
+                parser.write(chunk)
+                if self.pending:
+                    data, self.pending = b"".join(self.pending), []
+                    await run_in_threadpool(self.writer.write, data)
+            parser.finalize()
+            missing = [field for field in required_fields if field not in self.fields]
+            if self.writer is None or missing:
+                detail = ", ".join(missing if self.writer else ["file", *missing])
+                raise HTTPException(status_code=422, detail=f"Missing form fields: {detail}")
+            return await run_in_threadpool(self.writer.finish, kind, content_addressed)
+        except BaseException:
+            if self.writer is not None:
+                await run_in_threadpool(self.writer.abort)
+            raise
+
+
+def multipart_upload_openapi(*fields: str) -> dict[str, Any]:
+    # The upload endpoints read the body themselves, so FastAPI cannot derive the form schema.
+    properties = {"file": {"type": "string", "format": "binary"}, **{field: {"type": "string"} for field in fields}}
+    schema = {"type": "object", "properties": properties, "required": ["file", *fields]}
+    return {"requestBody": {"required": True, "content": {"multipart/form-data": {"schema": schema}}}}
+
+
+def acquire_blob(db: Session, upload: IngestedUpload) -> None:
+    statement = pg_insert(Blob).values(
+        sha256=upload.sha256,
+        stored_name=upload.stored_name,
+        size_bytes=upload.size_bytes,
+        ref_count=1,
+        created_at=datetime.utcnow(),
+    )
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[Blob.sha256], set_={"ref_count": Blob.__table__.c.ref_count + 1}
+        )
+    )
+
+
+def adjust_submission_counters(db: Session, changes: dict[tuple[str, SubmissionStatusEnum], int]) -> None:
+    # Upsert in key order so concurrent transactions lock counter rows in the same order.
+    for (submission_type, status), delta in sorted(changes.items()):
+        if not delta:
+            continue
+        statement = pg_insert(SubmissionCounter).values(type=submission_type, status=status, count=delta)
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[SubmissionCounter.type, SubmissionCounter.status],
+                set_={"count": SubmissionCounter.__table__.c.count + delta},
+            )
+        )
+
+
+def record_status_change(
+    db: Session, submission_type: str, old_status: SubmissionStatusEnum, new_status: SubmissionStatusEnum
+) -> None:
+    if old_status != new_status:
+        adjust_submission_counters(db, {(submission_type, old_status): -1, (submission_type, new_status): 1})
+
+
+def count_submissions(db: Session) -> dict[tuple[str, SubmissionStatusEnum], int]:
+    rows = db.execute(
+        select(Submission.type, Submission.status, func.count()).group_by(Submission.type, Submission.status)
+    ).all()
+    return {(submission_type, status): count for submission_type, status, count in rows}
+
+
+def reconcile_submission_counters(db: Session) -> dict[str, Any]:
+    # Blocks counter upserts (but not reads) until the rebuild commits, so no delta is lost in between.
+    db.execute(text("LOCK TABLE submission_counters IN EXCLUSIVE MODE"))
+    stored = {(row.type, row.status): row.count for row in db.scalars(select(SubmissionCounter))}
+    actual = count_submissions(db)
+    db.execute(delete(SubmissionCounter))
+    if actual:
+        db.execute(
+            insert(SubmissionCounter),
+            [{"type": key[0], "status": key[1], "count": count} for key, count in actual.items()],
+        )
+    db.commit()
+    drift = [
+        {"type": key[0], "status": key[1], "stored": stored.get(key, 0), "actual": actual.get(key, 0)}
+        for key in sorted(set(stored) | set(actual))
+        if stored.get(key, 0) != actual.get(key, 0)
+    ]
+    return {"rows": len(actual), "drift": drift}
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def approval_log_partitions(db: Session) -> dict[str, date]:
+    rows = db.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = 'approval_logs'"
+        )
+    ).scalars()
+    partitions = {}
+    for name in rows:
+        match = re.fullmatch(r"approval_logs_p(\d{4})(\d{2})", name)
+        if match:
+            partitions[name] = date(int(match.group(1)), int(match.group(2)), 1)
+    return partitions
+
+
+def lock_approval_log_partitions(db: Session) -> bool:
+    # Several workers run partition maintenance on a timer; only the lock holder changes partitions.
+    if db.scalar(select(func.pg_try_advisory_xact_lock(PARTITION_LOCK_ID))):
+        return True
+    db.rollback()
+    return False
+
+
+def ensure_approval_log_partitions(db: Session, months_ahead: int = APPROVAL_LOG_PARTITIONS_AHEAD) -> list[str]:
+    if not lock_approval_log_partitions(db):
+        return []
+    existing = approval_log_partitions(db)
+    created = []
+    current = month_start(datetime.utcnow().date())
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        name = f"approval_logs_p{month:%Y%m}"
+        if name in existing:
+            continue
+        lower, upper = day_start(month), day_start(add_months(month, 1))
+        # Rows that already landed in the default partition move into the new one before it is attached.
+        db.execute(text(f"CREATE TABLE {name} (LIKE approval_logs INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+        db.execute(
+            text(
+                f"WITH moved AS (DELETE FROM approval_logs_default WHERE created_at >= :lower AND created_at < :upper "
+                f"RETURNING *) INSERT INTO {name} SELECT * FROM moved"
+            ),
+            {"lower": lower, "upper": upper},
+        )
+        db.execute(
+            text(f"ALTER TABLE approval_logs ATTACH PARTITION {name} FOR VALUES FROM ('{lower}') TO ('{upper}')")
+        )
+        created.append(name)
+    db.commit()
+    return created
+
+
+def export_approval_log_partition(db: Session, name: str) -> tuple[str, int]:
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    archive_path = os.path.join(ARCHIVE_DIR, f"{name}.ndjson.gz")
+    temp_path = f"{archive_path}.part"
+    rows = db.execute(
+        text(f"SELECT id, submission_id, actor_user_id, action, note, created_at FROM {name} ORDER BY id"),
+        execution_options={"stream_results": True},
+    ).mappings()
+    count = 0
+    with open(temp_path, "wb") as raw:
+        with gzip.open(raw, "wt", encoding="utf-8") as archive:
+            for row in rows:
+                archive.write(json.dumps({**row, "created_at": row["created_at"].isoformat()}) + "\n")
+                count += 1
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(temp_path, archive_path)
+    return archive_path, count
+
+
+def archive_approval_log_partitions(
+    db: Session, retention_months: int = APPROVAL_LOG_RETENTION_MONTHS
+) -> list[dict[str, Any]]:
+    if retention_months <= 0:
+        return []
+    cutoff = add_months(month_start(datetime.utcnow().date()), -retention_months)
+    expired = [name for name, month in approval_log_partitions(db).items() if add_months(month, 1) <= cutoff]
+    db.rollback()
+    archived = []
+    for name in sorted(expired):
+        if not lock_approval_log_partitions(db):
+            break
+        if name not in approval_log_partitions(db):
+            db.rollback()
+            continue
+        archive_path, count = export_approval_log_partition(db, name)
+        db.execute(text(f"ALTER TABLE approval_logs DETACH PARTITION {name}"))
+        db.execute(text(f"DROP TABLE {name}"))
+        db.commit()
+        archived.append({"partition": name, "archive": archive_path, "rows": count})
+    return archived
+
+
+def maintain_approval_log_partitions(db: Session) -> dict[str, Any]:
+    return {"created": ensure_approval_log_partitions(db), "archived": archive_approval_log_partitions(db)}
+
+
+def build_submission_stats(counters: list[SubmissionCounter]) -> SubmissionStatsResponse:
+    by_status = {status: 0 for status in SubmissionStatusEnum}
+    by_type: dict[str, dict[SubmissionStatusEnum, int]] = {}
+    for counter in counters:
+        by_status[counter.status] += counter.count
+        by_type.setdefault(counter.type, {status: 0 for status in SubmissionStatusEnum})[counter.status] = counter.count
+    return SubmissionStatsResponse(total=sum(by_status.values()), by_status=by_status, by_type=by_type)
+
+
+def day_start(day: date) -> datetime:
+    return datetime(day.year, day.month, day.day)
+
+
+def decision_bucket_label(bound: int | None) -> str:
+    return str(bound) if bound is not None else "+Inf"
+
+
+def rollup_select(source, day, metric: str, dimension, value, *criteria):
+    facts = (
+        select(day.label("day"), literal(metric).label("metric"), dimension.label("dimension"), value.label("value"))
+        .select_from(source)
+        .where(*criteria)
+        .subquery()
+    )
+    return select(facts.c.day, facts.c.metric, facts.c.dimension, func.sum(facts.c.value)).group_by(
+        facts.c.day, facts.c.metric, facts.c.dimension
+    )
+
+
+def rollup_statements(start_at: datetime, end_at: datetime) -> list:
+    created_day = cast(Submission.created_at, Date)
+    decided_day = cast(ApprovalLog.created_at, Date)
+    decided = (
+        ApprovalLog.action.in_([SubmissionActionEnum.APPROVE, SubmissionActionEnum.REJECT]),
+        ApprovalLog.created_at >= start_at,
+        ApprovalLog.created_at < end_at,
+    )
+    decisions = ApprovalLog.__table__.join(Submission.__table__, Submission.id == ApprovalLog.submission_id)
+    decision_seconds = func.extract("epoch", ApprovalLog.created_at - Submission.created_at)
+    decision_bucket = case(
+        *[
+            (decision_seconds <= bound * 3600, literal(decision_bucket_label(bound)))
+            for bound in DECISION_TIME_BUCKETS_HOURS
+        ],
+        else_=literal(decision_bucket_label(None)),
+    )
+    one = literal(1)
+    return [
+        rollup_select(
+            Submission.__table__,
+            created_day,
+            "submissions_created",
+            Submission.type,
+            one,
+            Submission.created_at >= start_at,
+            Submission.created_at < end_at,
+        ),
+        rollup_select(
+            ApprovalLog.__table__,
+            decided_day,
+            "approvals",
+            cast(ApprovalLog.actor_user_id, String),
+            one,
+            ApprovalLog.action == SubmissionActionEnum.APPROVE,
+            *decided[1:],
+        ),
+        rollup_select(
+            ApprovalLog.__table__,
+            decided_day,
+            "rejections",
+            cast(ApprovalLog.actor_user_id, String),
+            one,
+            ApprovalLog.action == SubmissionActionEnum.REJECT,
+            *decided[1:],
+        ),
+        rollup_select(decisions, decided_day, "decision_hours", decision_bucket, one, *decided),
+        rollup_select(
+            decisions, decided_day, "decision_seconds", literal(""), cast(decision_seconds, BigInteger), *decided
+        ),
+    ]
+
+
+def refresh_daily_rollups(db: Session, through: date | None = None) -> date | None:
+    # Rolls every complete UTC day after the watermark; today stays out until it is over.
+    through = through or datetime.utcnow().date() - timedelta(days=1)
+    watermark = db.get(RollupWatermark, "daily")
+    if watermark and watermark.rolled_through >= through:
+        return watermark.rolled_through
+
+    if not db.scalar(select(func.pg_try_advisory_xact_lock(ROLLUP_LOCK_ID))):
+        db.rollback()
+        return watermark.rolled_through if watermark else None
+
+    watermark = db.get(RollupWatermark, "daily", populate_existing=True)
+    if watermark:
+        start = watermark.rolled_through + timedelta(days=1)
+    else:
+        first_created = db.scalar(select(func.min(Submission.created_at)))
+        start = first_created.date() if first_created else through + timedelta(days=1)
+        watermark = RollupWatermark(name="daily", rolled_through=through)
+        db.add(watermark)
+
+    if start <= through:
+        db.execute(delete(DailyRollup).where(DailyRollup.day >= start, DailyRollup.day <= through))
+        for statement in rollup_statements(day_start(start), day_start(through + timedelta(days=1))):
+            db.execute(insert(DailyRollup).from_select(["day", "metric", "dimension", "value"], statement))
+    watermark.rolled_through = max(watermark.rolled_through, through)
+    db.commit()
+    return watermark.rolled_through
+
+
+def rebuild_daily_rollups(db: Session) -> date | None:
+    db.execute(delete(DailyRollup))
+    db.execute(delete(RollupWatermark).where(RollupWatermark.name == "daily"))
+    db.commit()
+    return refresh_daily_rollups(db)
+
+
+def parse_report_period(period: str) -> tuple[date, date]:
+    try:
+        if re.fullmatch(r"\d{4}", period):
+            year = int(period)
+            return date(year, 1, 1), date(year, 12, 31)
+        if re.fullmatch(r"\d{4}-\d{2}", period):
+            year, month = (int(part) for part in period.split("-"))
+            return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+    except ValueError:
+        pass
+    raise HTTPException(status_code=400, detail="Invalid period")
+
+
+def histogram_quantile(quantile: float, buckets: dict[str, int]) -> float | None:
+    total = sum(buckets.values())
+    if not total:
+        return None
+    rank = quantile * total
+    cumulative = 0
+    lower = 0.0
+    for bound in DECISION_TIME_BUCKETS_HOURS + (None,):
+        count = buckets.get(decision_bucket_label(bound), 0)
+        if count and cumulative + count >= rank:
+            if bound is None:
+                return lower
+            return round(lower + (bound - lower) * (rank - cumulative) / count, 2)
+        cumulative += count
+        if bound is not None:
+            lower = float(bound)
+    return lower
+
+
+def build_report(db: Session, period: str, rolled_through: date | None) -> ReportResponse:
+    date_from, date_to = parse_report_period(period)
+    rows = db.execute(
+        select(DailyRollup.metric, DailyRollup.dimension, func.sum(DailyRollup.value))
+        .where(DailyRollup.day >= date_from, DailyRollup.day <= date_to)
+        .group_by(DailyRollup.metric, DailyRollup.dimension)
+    ).all()
+    metrics: dict[str, dict[str, int]] = {}
+    for metric, dimension, value in rows:
+        metrics.setdefault(metric, {})[dimension] = int(value)
+
+    approvals = metrics.get("approvals", {})
+    rejections = metrics.get("rejections", {})
+    actor_ids = sorted({int(actor_id) for actor_id in approvals.keys() | rejections.keys()})
+    names = dict(db.execute(select(User.id, User.full_name).where(User.id.in_(actor_ids))).all()) if actor_ids else {}
+    decisions_by_admin = sorted(
+        (
+            AdminDecisionReport(
+                actor_user_id=actor_id,
+                full_name=names.get(actor_id),
+                approved=approvals.get(str(actor_id), 0),
+                rejected=rejections.get(str(actor_id), 0),
+            )
+            for actor_id in actor_ids
+        ),
+        key=lambda item: item.approved + item.rejected,
+        reverse=True,
+    )
+
+    buckets = metrics.get("decision_hours", {})
+    decisions = sum(buckets.values())
+    decision_seconds = metrics.get("decision_seconds", {}).get("", 0)
+    submissions_by_type = metrics.get("submissions_created", {})
+    return ReportResponse(
+        period=period,
+        date_from=date_from,
+        date_to=date_to,
+        rolled_through=rolled_through,
+        submissions_total=sum(submissions_by_type.values()),
+        submissions_by_type=submissions_by_type,
+        decisions_by_admin=decisions_by_admin,
+        time_to_decision=DecisionTimeReport(
+            decisions=decisions,
+            mean_hours=round(decision_seconds / decisions / 3600, 2) if decisions else None,
+            p50_hours=histogram_quantile(0.5, buckets),
+            p90_hours=histogram_quantile(0.9, buckets),
+            p95_hours=histogram_quantile(0.95, buckets),
+            histogram={
+                decision_bucket_label(bound): buckets.get(decision_bucket_label(bound), 0)
+                for bound in DECISION_TIME_BUCKETS_HOURS + (None,)
+            },
+        ),
+    )
+
+
+def letter_path(submission: Submission) -> str:
+    return os.path.join(LETTERS_DIR, f"{submission.id}-{submission.updated_at:%Y%m%d%H%M%S%f}.pdf")
+
+
+def letter_fields(submission: Submission, owner: User) -> dict[str, str]:
+    payload = submission.payload if isinstance(submission.payload, dict) else {}
+    fields = {
+        key: str(value)
+        for key, value in payload.items()
+        if isinstance(value, (str, int, float)) and not isinstance(value, bool) and str(value).strip()
+    }
+    issued = submission.updated_at
+    fields.update(
+        type=submission.type,
+        full_name=owner.full_name or "-",
+        nik=owner.nik or "-",
+        kk_number=owner.kk_number or "-",
+        phone_number=owner.phone_number or "-",
+        email=owner.email,
+        letter_number=f"{submission.id:04d}/SP/{LETTER_ORG_NAME}/{issued.month:02d}/{issued.year}",
+        issued_date=letters.format_date_id(issued.year, issued.month, issued.day),
+        org_name=LETTER_ORG_NAME,
+        org_address=LETTER_ORG_ADDRESS,
+        org_city=LETTER_ORG_CITY,
+        signer_name=LETTER_SIGNER_NAME or "(..............................)",
+    )
+    return fields
+
+
+def prune_letters(submission_id: int, keep_path: str) -> None:
+    for stale_path in glob.glob(os.path.join(LETTERS_DIR, f"{submission_id}-*.pdf")):
+        if stale_path != keep_path:
+            os.remove(stale_path)
+
+
+def finish_letter_render(submission_id: int, path: str, future: Future) -> None:
+    with letter_renders_lock:
+        letter_renders.pop(path, None)
+    if not future.cancelled() and future.exception() is None:
+        prune_letters(submission_id, path)
+
+
+def submit_letter_render(submission: Submission, owner: User) -> Future:
+    # Concurrent downloads and the APPROVE pre-render share one in-flight render per output path.
+    path = letter_path(submission)
+    with letter_renders_lock:
+        future = letter_renders.get(path)
+        if future is None:
+            future = get_letter_pool().submit(
+                letters.render_letter, path, submission.type, letter_fields(submission, owner)
+            )
+            letter_renders[path] = future
+            submission_id = submission.id
+            future.add_done_callback(lambda done: finish_letter_render(submission_id, path, done))
+    return future
+
+
+def submission_event(
+    event_type: str,
+    submission_id: int,
+    user_id: int,
+    submission_type: str,
+    status: SubmissionStatusEnum,
+    action: SubmissionActionEnum | None = None,
+    log_id: int | None = None,
+) -> dict[str, Any]:
+    return {
+        "type": event_type,
+        "submission_id": submission_id,
+        "user_id": user_id,
+        "submission_type": submission_type,
+        "status": status.value,
+        "action": action.value if action else None,
+        "log_id": log_id,
+        "at": datetime.utcnow().isoformat(),
+    }
+
+
+def notify_submission_events(db: Session, events: list[dict[str, Any]]) -> None:
+    # NOTIFY is transactional: listeners in every worker only see events whose transaction committed.
+    if not events:
+        return
+    db.execute(
+        text("SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload"),
+        {"channel": EVENTS_CHANNEL, "payloads": [json.dumps(event) for event in events]},
+    )
+
+
+def listen_for_events(broker: EventBroker) -> None:
+    retry_delay = 1.0
+    while True:
+        connection = None
+        try:
+            connect_args, connect_kwargs = engine.dialect.create_connect_args(engine.url)
+            connection = engine.dialect.connect(*connect_args, **connect_kwargs)
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {EVENTS_CHANNEL}")
+                cursor.execute(f"LISTEN {CACHE_CHANNEL}")
+            # Invalidations sent while the listener was down were missed; start from empty caches.
+            clear_shared_caches()
+            retry_delay = 1.0
+            with selectors.DefaultSelector() as selector:
+                selector.register(connection, selectors.EVENT_READ)
+                while True:
+                    if not selector.select(timeout=60):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        notify = connection.notifies.pop(0)
+                        if notify.channel == CACHE_CHANNEL:
+                            apply_cache_invalidation(json.loads(notify.payload))
+                        else:
+                            broker.publish(json.loads(notify.payload))
+        except Exception:
+            time.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, 30.0)
+        finally:
+            if connection is not None:
+                connection.close()
+
+
+def format_sse(event: dict[str, Any]) -> str:
+    lines = [f"event: {event['type']}"]
+    if event.get("log_id"):
+        lines.append(f"id: {event['log_id']}")
+    lines.append(f"data: {json.dumps(event)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def event_stream(request: Request, key: str):
+    queue = event_broker.subscribe(key)
+    if queue is None:
+        return
+    try:
+        yield f"retry: 5000\n: connected to {key}\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), SSE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": ping\n\n"
+                continue
+            yield format_sse(event)
+    finally:
+        event_broker.unsubscribe(key, queue)
+
+
+def authenticate_token(token: str) -> User:
+    with SessionLocal() as db:
+        return get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token), db)
+
+
+def job_handler(kind: str, concurrency: int = 1):
+    def register(fn):
+        job_handlers[kind] = JobHandler(fn=fn, concurrency=concurrency)
+        return fn
+
+    return register
+
+
+def enqueue_jobs(db: Session, kind: str, payloads: list[dict[str, Any]], delay_seconds: float = 0) -> None:
+    # Rows are written in the caller's transaction, so a job exists only if the change that needs it commits.
+    if kind not in job_handlers:
+        raise ValueError(f"Unknown job kind: {kind}")
+    if not payloads:
+        return
+    now = datetime.utcnow()
+    db.execute(
+        insert(Job),
+        [
+            {
+                "kind": kind,
+                "payload": payload,
+                "status": JobStatusEnum.QUEUED,
+                "attempts": 0,
+                "max_attempts": JOB_MAX_ATTEMPTS,
+                "run_at": now + timedelta(seconds=delay_seconds),
+                "created_at": now,
+            }
+            for payload in payloads
+        ],
+    )
+
+
+def enqueue_job(db: Session, kind: str, payload: dict[str, Any], delay_seconds: float = 0) -> None:
+    enqueue_jobs(db, kind, [payload], delay_seconds)
+
+
+def job_stats(db: Session) -> dict[str, Any]:
+    now = datetime.utcnow()
+    kinds: dict[str, dict[str, Any]] = {
+        kind: {
+            **{status.value.lower(): 0 for status in JobStatusEnum},
+            "ready": 0,
+            "oldest_ready_seconds": None,
+            "concurrency": handler.concurrency,
+        }
+        for kind, handler in job_handlers.items()
+    }
+    for kind, status, count in db.execute(select(Job.kind, Job.status, func.count()).group_by(Job.kind, Job.status)):
+        kinds.setdefault(kind, {status.value.lower(): 0 for status in JobStatusEnum})[status.value.lower()] = count
+
+    ready_rows = db.execute(
+        select(Job.kind, func.count(), func.min(Job.run_at))
+        .where(Job.status == JobStatusEnum.QUEUED, Job.run_at <= now)
+        .group_by(Job.kind)
+    )
+    for kind, count, oldest in ready_rows:
+        kinds[kind]["ready"] = count
+        kinds[kind]["oldest_ready_seconds"] = round((now - oldest).total_seconds(), 3)
+
+    wait_seconds = func.extract("epoch", Job.started_at - Job.run_at)
+    run_seconds = func.extract("epoch", Job.finished_at - Job.started_at)
+    latency_rows = db.execute(
+        select(
+            Job.kind,
+            func.count(),
+            func.percentile_cont(0.5).within_group(wait_seconds),
+            func.percentile_cont(0.95).within_group(wait_seconds),
+            func.percentile_cont(0.5).within_group(run_seconds),
+            func.percentile_cont(0.95).within_group(run_seconds),
+        )
+        .where(
+            Job.status == JobStatusEnum.DONE,
+            Job.finished_at >= now - timedelta(minutes=JOB_LATENCY_WINDOW_MINUTES),
+        )
+        .group_by(Job.kind)
+    )
+    latency = {
+        kind: {
+            "samples": samples,
+            "wait_p50_seconds": round(wait_p50, 3),
+            "wait_p95_seconds": round(wait_p95, 3),
+            "run_p50_seconds": round(run_p50, 3),
+            "run_p95_seconds": round(run_p95, 3),
+        }
+        for kind, samples, wait_p50, wait_p95, run_p50, run_p95 in latency_rows
+    }
+    return {"kinds": kinds, "latency_window_minutes": JOB_LATENCY_WINDOW_MINUTES, "latency": latency}
+
+
 def slugify(value: str) -> str:
     cleaned = []
     last_dash = False
@@ -380,6 +2006,92 @@ def build_announcement_cover_url(announcement: Announcement) -> str | None:
     return f"/api/announcements/{announcement.id}/cover"
 
 
+def build_announcement_cover_urls(announcement: Announcement) -> dict[str, str] | None:
+    cover_url = build_announcement_cover_url(announcement)
+    if not cover_url:
+        return None
+    return {size: f"{cover_url}?size={size}" for size in COVER_VARIANTS}
+
+
+def parse_cover_focus(focus: str | None) -> tuple[float, float]:
+    x, y = 0.5, 0.5
+    percents = []
+    for part in (focus or "center").lower().split():
+        if part in ("left", "right"):
+            x = 0.0 if part == "left" else 1.0
+        elif part in ("top", "bottom"):
+            y = 0.0 if part == "top" else 1.0
+        elif part.endswith("%"):
+            try:
+                percents.append(min(max(float(part[:-1]) / 100, 0.0), 1.0))
+            except ValueError:
+                continue
+    if percents:
+        x = percents[0]
+        y = percents[1] if len(percents) > 1 else y
+    return x, y
+
+
+def cover_variant_name(stored_name: str, size: str, fmt: str) -> str:
+    return f"{os.path.splitext(stored_name)[0]}-{size}.{fmt}"
+
+
+def save_cover_variant(variant: Image.Image, variant_path: str, pil_format: str) -> None:
+    # The worker job and the on-demand fallback can render the same variant at once, so each
+    # writer gets its own temp file and the last complete one wins the rename.
+    fd, temp_path = tempfile.mkstemp(dir=ANNOUNCEMENTS_DIR, suffix=".part")
+    try:
+        os.fchmod(fd, letters.SERVED_FILE_MODE)
+        with os.fdopen(fd, "wb") as buffer:
+            variant.save(buffer, pil_format, quality=80, optimize=True)
+        os.replace(temp_path, variant_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def generate_cover_variants(
+    stored_name: str,
+    focus: str | None,
+    sizes: Iterable[str] = tuple(COVER_VARIANTS),
+    formats: Iterable[str] = tuple(COVER_FORMATS),
+) -> None:
+    with Image.open(os.path.join(ANNOUNCEMENTS_DIR, stored_name)) as source:
+        image = ImageOps.exif_transpose(source).convert("RGB")
+
+    centering = parse_cover_focus(focus)
+    formats = tuple(formats)
+    for size in sizes:
+        width, height = COVER_VARIANTS[size]
+        scale = min(1.0, image.width / width, image.height / height)
+        target = (max(1, round(width * scale)), max(1, round(height * scale)))
+        variant = ImageOps.fit(image, target, method=Image.Resampling.LANCZOS, centering=centering)
+        for fmt in formats:
+            variant_path = os.path.join(ANNOUNCEMENTS_DIR, cover_variant_name(stored_name, size, fmt))
+            save_cover_variant(variant, variant_path, COVER_FORMATS[fmt][0])
+
+
+def verify_cover_image(stored_name: str) -> None:
+    with Image.open(os.path.join(ANNOUNCEMENTS_DIR, stored_name)) as image:
+        image.verify()
+
+
+def remove_cover_variants(stored_name: str) -> None:
+    for size in COVER_VARIANTS:
+        for fmt in COVER_FORMATS:
+            path = os.path.join(ANNOUNCEMENTS_DIR, cover_variant_name(stored_name, size, fmt))
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def remove_cover_files(stored_name: str) -> None:
+    remove_cover_variants(stored_name)
+    path = os.path.join(ANNOUNCEMENTS_DIR, stored_name)
+    if os.path.exists(path):
+        os.remove(path)
+
+
 def serialize_announcement(announcement: Announcement, author_name: str | None = None) -> AnnouncementResponse:
     return AnnouncementResponse(
         id=announcement.id,
@@ -390,6 +2102,7 @@ def serialize_announcement(announcement: Announcement, author_name: str | None =
         content=announcement.content,
         status=announcement.status,
         cover_url=build_announcement_cover_url(announcement),
+        cover_urls=build_announcement_cover_urls(announcement),
         cover_name=announcement.cover_original_name,
         cover_focus=announcement.cover_focus,
         author_name=author_name,
@@ -399,23 +2112,65 @@ def serialize_announcement(announcement: Announcement, author_name: str | None =
     )
 
 
-def serialize_announcement_list_item(
-    announcement: Announcement, author_name: str | None = None
-) -> AnnouncementListItem:
-    return AnnouncementListItem(
-        id=announcement.id,
-        slug=announcement.slug,
-        title=announcement.title,
-        excerpt=announcement.excerpt,
-        category=announcement.category,
-        status=announcement.status,
-        cover_url=build_announcement_cover_url(announcement),
-        cover_focus=announcement.cover_focus,
-        author_name=author_name,
-        published_at=announcement.published_at,
-        created_at=announcement.created_at,
-        updated_at=announcement.updated_at,
-    )
+def serialize_announcement_list_item(row, author_name: str | None = None) -> dict[str, Any]:
+    # Keys follow AnnouncementListItem field order so the orjson path matches the validated output byte for byte.
+    return {
+        "id": row.id,
+        "slug": row.slug,
+        "title": row.title,
+        "excerpt": row.excerpt,
+        "category": row.category,
+        "status": row.status,
+        "cover_url": build_announcement_cover_url(row),
+        "cover_urls": build_announcement_cover_urls(row),
+        "cover_focus": row.cover_focus,
+        "author_name": author_name,
+        "published_at": row.published_at,
+        "created_at": row.created_at,
+        "updated_at": row.updated_at,
+    }
+
+
+def list_json_response(items: list[dict[str, Any]] | dict[str, Any], headers: dict[str, str] | None = None):
+    # The stdlib path hands the rows to FastAPI, which validates them against response_model.
+    # The orjson path returns a response directly, skipping that second pass.
+    if JSON_ENCODER == "orjson":
+        return ORJSONResponse(items, headers=headers)
+    return items
+
+
+def render_json(content: Any) -> bytes:
+    if JSON_ENCODER == "orjson":
+        return orjson.dumps(content, default=jsonable_encoder)
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def flatten_search_values(value: Any) -> list[str]:
+    if isinstance(value, dict):
+        return [part for item in value.values() for part in flatten_search_values(item)]
+    if isinstance(value, (list, tuple)):
+        return [part for item in value for part in flatten_search_values(item)]
+    if value is None or isinstance(value, bool):
+        return []
+    return [str(value)]
+
+
+def build_submission_search_text(submission: Submission, owner: User) -> str:
+    parts = [owner.email, owner.full_name, owner.nik, submission.type, *flatten_search_values(submission.payload)]
+    return " ".join(part for part in parts if part).lower()
+
+
+def build_announcement_search_text(announcement: Announcement) -> str:
+    parts = [announcement.title, announcement.excerpt, announcement.category, announcement.slug]
+    return " ".join(part for part in parts if part).lower()
+
+
+def build_search_query(q: str):
+    terms = [re.sub(r"[^\w@.\-]", "", term) for term in q.lower().split()]
+    terms = [term for term in terms if re.search(r"\w", term)]
+    if not terms:
+        return None
+    return func.to_tsquery(SEARCH_CONFIG, " & ".join(f"{term}:*" for term in terms))
 
 
 def generate_unique_slug(db: Session, raw_slug: str) -> str:
@@ -428,6 +2183,20 @@ def generate_unique_slug(db: Session, raw_slug: str) -> str:
     return candidate
 
 
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), item_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, item_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(item_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 def ensure_profile_complete(user: User) -> None:
     if not all([user.full_name, user.phone_number, user.nik, user.kk_number]):
         raise HTTPException(status_code=400, detail="Profile incomplete")
@@ -443,10 +2212,386 @@ def map_action_to_status(action: SubmissionActionEnum) -> SubmissionStatusEnum:
     return SubmissionStatusEnum.NEED_REVISION
 
 
+def etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return "*" in candidates or etag.removeprefix("W/") in [c.removeprefix("W/") for c in candidates]
+
+
+def lookup_public_cache(key: Any) -> tuple[int, CachedJSON | None]:
+    version = public_cache_version
+    return version, public_cache.get((version, key))
+
+
+def store_public_cache(version: int, key: Any, content: Any) -> CachedJSON:
+    body = render_json(content)
+    cached = CachedJSON(body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+    if version == public_cache_version:
+        public_cache.set((version, key), cached)
+    return cached
+
+
+def invalidate_public_cache() -> None:
+    global public_cache_version
+    public_cache_version += 1
+    public_cache.clear()
+
+
+def public_cache_response(request: Request, cached: CachedJSON) -> Response:
+    headers = {"ETag": cached.etag, "Cache-Control": f"public, max-age={PUBLIC_CACHE_MAX_AGE}"}
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(cached.body, media_type="application/json", headers=headers)
+
+
+def own_submissions_query(user_id: int, status: SubmissionStatusEnum | None, type: str | None):
+    query = select(Submission).where(Submission.user_id == user_id)
+    if status:
+        query = query.where(Submission.status == status)
+    if type:
+        query = query.where(Submission.type == type)
+    return query.order_by(Submission.created_at.desc())
+
+
+def submission_detail_query(submission_id: int, with_owner: bool = False):
+    query = (
+        select(Submission)
+        .where(Submission.id == submission_id)
+        .options(joinedload(Submission.files), selectinload(Submission.logs))
+    )
+    if with_owner:
+        query = query.options(joinedload(Submission.owner))
+    return query
+
+
+def submission_fields(submission: Submission) -> dict[str, Any]:
+    return {name: getattr(submission, name) for name in SubmissionResponse.model_fields}
+
+
+def build_submission_detail(submission: Submission) -> SubmissionDetailResponse:
+    return SubmissionDetailResponse(
+        **submission_fields(submission),
+        files=[SubmissionFileResponse.model_validate(file) for file in submission.files],
+        last_action=ApprovalLogResponse.model_validate(submission.logs[0]) if submission.logs else None,
+    )
+
+
+def build_admin_submission_detail(submission: Submission) -> AdminSubmissionDetailResponse:
+    owner = submission.owner
+    return AdminSubmissionDetailResponse(
+        **submission_fields(submission),
+        owner_email=owner.email if owner else "",
+        owner_full_name=owner.full_name if owner else None,
+        owner_phone_number=owner.phone_number if owner else None,
+        owner_nik=owner.nik if owner else None,
+        owner_kk_number=owner.kk_number if owner else None,
+        files=[SubmissionFileResponse.model_validate(file) for file in submission.files],
+        logs=[ApprovalLogResponse.model_validate(log) for log in submission.logs],
+    )
+
+
+def admin_submission_filters(
+    status: SubmissionStatusEnum | None,
+    type: str | None,
+    q: str | None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> list:
+    filters = []
+    if status:
+        filters.append(Submission.status == status)
+    if type:
+        filters.append(Submission.type == type)
+    search_query = build_search_query(q) if q else None
+    if search_query is not None:
+        filters.append(search_vector(Submission.search_text).op("@@")(search_query))
+    if date_from:
+        filters.append(Submission.created_at >= day_start(date_from))
+    if date_to:
+        filters.append(Submission.created_at < day_start(date_to + timedelta(days=1)))
+    return filters
+
+
+def admin_submissions_query(
+    status: SubmissionStatusEnum | None, type: str | None, q: str | None, cursor: str | None, limit: int
+):
+    # Columns in AdminSubmissionListItem field order; rows become response dicts via _asdict().
+    query = select(
+        Submission.id,
+        Submission.user_id,
+        User.email.label("owner_email"),
+        User.full_name.label("owner_full_name"),
+        User.phone_number.label("owner_phone_number"),
+        User.nik.label("owner_nik"),
+        User.kk_number.label("owner_kk_number"),
+        Submission.type,
+        Submission.status,
+        Submission.created_at,
+        Submission.updated_at,
+    ).join(User, User.id == Submission.user_id)
+    query = query.where(*admin_submission_filters(status, type, q))
+
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        query = query.where(tuple_(Submission.created_at, Submission.id) < tuple_(cursor_created_at, cursor_id))
+
+    query = query.order_by(Submission.created_at.desc(), Submission.id.desc())
+    # One extra row tells whether another page follows.
+    return query.limit(limit + 1)
+
+
+def build_admin_submission_page(rows, limit: int):
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return list_json_response({"items": [row._asdict() for row in rows], "next_cursor": next_cursor})
+
+
+def export_submissions_query(filters: list):
+    return (
+        select(
+            Submission.id,
+            Submission.type,
+            Submission.status,
+            Submission.created_at,
+            Submission.updated_at,
+            Submission.user_id,
+            User.email.label("owner_email"),
+            User.full_name.label("owner_full_name"),
+            User.phone_number.label("owner_phone_number"),
+            User.nik.label("owner_nik"),
+            User.kk_number.label("owner_kk_number"),
+            Submission.payload,
+        )
+        .join(User, User.id == Submission.user_id)
+        .where(*filters)
+        .order_by(Submission.created_at, Submission.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+
+def export_row(row) -> dict[str, Any]:
+    item = row._asdict()
+    item["status"] = item["status"].value
+    item["created_at"] = item["created_at"].isoformat()
+    item["updated_at"] = item["updated_at"].isoformat()
+    return item
+
+
+def format_csv_rows(rows) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        item = export_row(row)
+        item["payload"] = json.dumps(item["payload"], ensure_ascii=False, separators=(",", ":"))
+        writer.writerow([item[column] for column in EXPORT_COLUMNS])
+    return buffer.getvalue()
+
+
+def format_ndjson_rows(rows) -> str:
+    return "".join(json.dumps(export_row(row), ensure_ascii=False, separators=(",", ":")) + "\n" for row in rows)
+
+
+def export_submissions(filters: list, format: str):
+    # Runs after the request session is gone, so the stream owns its session. yield_per makes
+    # psycopg2 use a server-side cursor, keeping one batch in memory however large the export is.
+    if format == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(EXPORT_COLUMNS)
+        yield buffer.getvalue().encode()
+    formatter = format_csv_rows if format == "csv" else format_ndjson_rows
+    with SessionLocal() as db:
+        for rows in db.execute(export_submissions_query(filters)).partitions():
+            yield formatter(rows).encode()
+
+
+def announcement_list_columns():
+    return (
+        Announcement.id,
+        Announcement.slug,
+        Announcement.title,
+        Announcement.excerpt,
+        Announcement.category,
+        Announcement.status,
+        Announcement.cover_stored_name,
+        Announcement.cover_focus,
+        Announcement.published_at,
+        Announcement.created_at,
+        Announcement.updated_at,
+    )
+
+
+def public_announcements_query():
+    return (
+        select(*announcement_list_columns())
+        .where(Announcement.status == AnnouncementStatusEnum.PUBLISHED)
+        .order_by(Announcement.published_at.desc().nullslast(), Announcement.created_at.desc())
+    )
+
+
+def public_announcement_query(slug: str):
+    return select(Announcement).where(
+        Announcement.slug == slug, Announcement.status == AnnouncementStatusEnum.PUBLISHED
+    )
+
+
+def admin_announcement_query(announcement_id: int):
+    return select(Announcement).options(joinedload(Announcement.author)).where(Announcement.id == announcement_id)
+
+
+def announcement_author_name(announcement: Announcement) -> str | None:
+    return announcement.author.full_name if announcement.author else None
+
+
+def admin_announcements_query(status: AnnouncementStatusEnum | None, q: str | None):
+    query = select(*announcement_list_columns(), User.full_name.label("author_name")).outerjoin(
+        User, User.id == Announcement.author_user_id
+    )
+    if status:
+        query = query.where(Announcement.status == status)
+    search_query = build_search_query(q) if q else None
+    if search_query is not None:
+        vector = search_vector(Announcement.search_text)
+        query = query.where(vector.op("@@")(search_query)).order_by(func.ts_rank_cd(vector, search_query).desc())
+    return query.order_by(Announcement.updated_at.desc())
+
+
+def enqueue_cover_variants(db: Session, announcement: Announcement) -> None:
+    enqueue_job(
+        db, "cover.variants", {"announcement_id": announcement.id, "stored_name": announcement.cover_stored_name}
+    )
+
+
+@job_handler("letter.render", concurrency=1)
+def render_letter_job(db: Session, payload: dict[str, Any]) -> None:
+    submission = db.scalar(
+        select(Submission).options(joinedload(Submission.owner)).where(Submission.id == payload["submission_id"])
+    )
+    if not submission or submission.status != SubmissionStatusEnum.APPROVED:
+        return
+    path = letter_path(submission)
+    if not os.path.exists(path):
+        ensure_letters_dir()
+        letters.render_letter(path, submission.type, letter_fields(submission, submission.owner))
+    prune_letters(submission.id, path)
+
+
+@job_handler("cover.variants", concurrency=2)
+def cover_variants_job(db: Session, payload: dict[str, Any]) -> None:
+    announcement = db.scalar(select(Announcement).where(Announcement.id == payload["announcement_id"]))
+    # A newer upload or removal supersedes the job; its own job covers the new file.
+    if not announcement or announcement.cover_stored_name != payload["stored_name"]:
+        return
+    generate_cover_variants(announcement.cover_stored_name, announcement.cover_focus)
+
+
+def start_query_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    context.query_started = time.perf_counter()
+
+
+def record_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    seconds = time.perf_counter() - context.query_started
+    stats = request_query_stats.get()
+    if stats is not None:
+        stats.record(statement, seconds)
+    if SLOW_QUERY_MS > 0 and seconds * 1000 >= SLOW_QUERY_MS:
+        sql_logger.warning(
+            "slow query %.1f ms on %s: %s params=%s",
+            seconds * 1000,
+            stats.route() if stats is not None else "-",
+            " ".join(statement.split()),
+            repr(parameters)[:SQL_LOG_PARAMS_CHARS],
+        )
+
+
+for instrumented_engine in [engine] + ([async_engine.sync_engine] if async_engine is not None else []):
+    event.listen(instrumented_engine, "before_cursor_execute", start_query_timer)
+    event.listen(instrumented_engine, "after_cursor_execute", record_query)
+
+
+def count_pool_checkout(name: str) -> Callable[..., None]:
+    return lambda *_: db_pool_checkouts.inc(name)
+
+
+event.listen(engine, "checkout", count_pool_checkout("sync"))
+if async_engine is not None:
+    event.listen(async_engine.sync_engine, "checkout", count_pool_checkout("async"))
+
+
+@metrics_registry.collector
+def collect_pool_metrics() -> None:
+    engines = [("sync", engine)] + ([("async", async_engine.sync_engine)] if async_engine is not None else [])
+    for name, current in engines:
+        pool = current.pool
+        if not isinstance(pool, QueuePool):
+            continue
+        db_pool_connections.set(name, "size", value=pool.size())
+        db_pool_connections.set(name, "checked_in", value=pool.checkedin())
+        db_pool_connections.set(name, "checked_out", value=pool.checkedout())
+        # overflow() counts up from -size, so it only goes positive once the pool itself is exhausted.
+        db_pool_connections.set(name, "overflow", value=max(0, pool.overflow()))
+
+
+@metrics_registry.collector
+def collect_threadpool_metrics() -> None:
+    # Sync endpoints and dependencies run on this limiter; borrowed == total means requests queue for a thread.
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    threadpool_tokens.set("total", value=limiter.total_tokens)
+    threadpool_tokens.set("borrowed", value=limiter.borrowed_tokens)
+    threadpool_tokens.set("waiting", value=limiter.statistics().tasks_waiting)
+
+
+@metrics_registry.collector
+def collect_process_metrics() -> None:
+    try:
+        usage = shutil.disk_usage(UPLOADS_DIR)
+    except OSError:
+        pass
+    else:
+        uploads_disk_bytes.set("free", value=usage.free)
+        uploads_disk_bytes.set("total", value=usage.total)
+    event_stream_clients.set(value=event_broker.stats()["clients"])
+
+
+async def flush_metrics_periodically() -> None:
+    # On the event loop, like the scrape itself: collect_threadpool_metrics can only read the limiter there.
+    while True:
+        await asyncio.sleep(METRICS_FLUSH_SECONDS)
+        try:
+            metrics_registry.flush()
+        except OSError:
+            metrics_logger.exception("metrics snapshot failed")
+
+
 @app.on_event("startup")
 def on_startup():
     ensure_uploads_dir()
     ensure_announcements_dir()
+    ensure_letters_dir()
+    get_hash_pool()
+    # Also carries cache invalidations from the other workers, so it runs before the first SSE client.
+    event_broker.start_listener()
+
+
+@app.on_event("startup")
+async def start_metrics_flush():
+    global metrics_flush_task
+    if METRICS_DIR:
+        metrics_registry.flush()
+        metrics_flush_task = asyncio.create_task(flush_metrics_periodically())
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    if metrics_flush_task is not None:
+        metrics_flush_task.cancel()
+        metrics_registry.flush()
+    shutdown_hash_pool()
+    shutdown_letter_pool()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 
 @app.get("/api/health")
@@ -454,6 +2599,15 @@ def health_check():
     return {"status": "ok"}
 
 
+@app.get("/api/metrics", include_in_schema=False)
+async def metrics_endpoint(credentials: HTTPAuthorizationCredentials | None = Depends(security)):
+    # Runs on the event loop: the threadpool limiter can only be read there, and scraping
+    # must not wait behind the very threadpool it is measuring.
+    if METRICS_TOKEN and not (credentials and secrets.compare_digest(credentials.credentials, METRICS_TOKEN)):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return Response(metrics_registry.render(), media_type=metrics.CONTENT_TYPE)
+
+
 @app.post("/api/auth/register", response_model=UserResponse)
 def register(payload: RegisterRequest, db: Session = Depends(get_db)):
     existing = db.scalar(select(User).where(User.email == payload.email))
@@ -478,9 +2632,16 @@ def register(payload: RegisterRequest, db: Session = Depends(get_db)):
 @app.post("/api/auth/login", response_model=TokenResponse)
 def login(payload: LoginRequest, db: Session = Depends(get_db)):
     user = db.scalar(select(User).where(User.email == payload.email))
-    if not user or not verify_password(payload.password, user.hashed_password):
+    if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
+    valid, new_hash = verify_and_update_password(payload.password, user.hashed_password)
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    if new_hash:
+        user.hashed_password = new_hash
+        db.commit()
+
     token = create_access_token(user.id)
     return TokenResponse(access_token=token)
 
@@ -507,7 +2668,18 @@ def create_submission(
         payload=payload.payload,
         status=SubmissionStatusEnum.SUBMITTED,
     )
+    submission.search_text = build_submission_search_text(submission, current_user)
     db.add(submission)
+    adjust_submission_counters(db, {(submission.type, submission.status): 1})
+    db.flush()
+    notify_submission_events(
+        db,
+        [
+            submission_event(
+                "submission.created", submission.id, submission.user_id, submission.type, submission.status
+            )
+        ],
+    )
     db.commit()
     db.refresh(submission)
     return submission
@@ -523,13 +2695,7 @@ def list_own_submissions(
     if current_user.role != RoleEnum.WARGA:
         raise HTTPException(status_code=403, detail="Warga only")
 
-    query = select(Submission).where(Submission.user_id == current_user.id)
-    if status:
-        query = query.where(Submission.status == status)
-    if type:
-        query = query.where(Submission.type == type)
-
-    submissions = db.scalars(query.order_by(Submission.created_at.desc())).all()
+    submissions = db.scalars(own_submissions_query(current_user.id, status, type)).all()
     return list(submissions)
 
 
@@ -539,35 +2705,17 @@ def get_submission_detail(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    submission = db.scalar(select(Submission).where(Submission.id == submission_id))
+    submission = db.execute(submission_detail_query(submission_id)).unique().scalar_one_or_none()
     if not submission:
         raise HTTPException(status_code=404, detail="Submission not found")
 
     if submission.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Forbidden")
 
-    files = db.scalars(select(SubmissionFile).where(SubmissionFile.submission_id == submission_id)).all()
-    last_log = db.scalar(
-        select(ApprovalLog)
-        .where(ApprovalLog.submission_id == submission_id)
-        .order_by(ApprovalLog.created_at.desc())
-    )
-
-    return SubmissionDetailResponse(
-        **SubmissionResponse.model_validate(submission).model_dump(),
-        files=[SubmissionFileResponse.model_validate(file) for file in files],
-        last_action=ApprovalLogResponse.model_validate(last_log) if last_log else None,
-    )
+    return build_submission_detail(submission)
 
 
-@app.post("/api/submissions/{submission_id}/files", response_model=SubmissionFileResponse)
-def upload_submission_file(
-    submission_id: int,
-    document_type: str = Form(...),
-    file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
+def load_uploadable_submission(db: Session, submission_id: int, current_user: User) -> Submission:
     submission = db.scalar(select(Submission).where(Submission.id == submission_id))
     if not submission:
         raise HTTPException(status_code=404, detail="Submission not found")
@@ -576,21 +2724,21 @@ def upload_submission_file(
         raise HTTPException(status_code=403, detail="Forbidden")
 
     ensure_uploads_dir()
-    extension = os.path.splitext(file.filename or "")[1]
-    stored_name = f"{uuid4().hex}{extension}"
-    stored_path = os.path.join(UPLOADS_DIR, stored_name)
+    return submission
 
-    with open(stored_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
 
-    size_bytes = os.path.getsize(stored_path)
+def store_submission_file(
+    db: Session, submission: Submission, reader: MultipartUploadReader, upload: IngestedUpload
+) -> SubmissionFile:
+    acquire_blob(db, upload)
     submission_file = SubmissionFile(
         submission_id=submission.id,
-        document_type=document_type,
-        original_name=file.filename or stored_name,
-        stored_name=stored_name,
-        mime_type=file.content_type or "application/octet-stream",
-        size_bytes=size_bytes,
+        document_type=reader.fields["document_type"],
+        original_name=reader.filename or upload.stored_name,
+        stored_name=upload.stored_name,
+        mime_type=upload.mime_type,
+        size_bytes=upload.size_bytes,
+        blob_sha256=upload.sha256,
     )
     db.add(submission_file)
     db.commit()
@@ -598,9 +2746,30 @@ def upload_submission_file(
     return submission_file
 
 
+@app.post(
+    "/api/submissions/{submission_id}/files",
+    response_model=SubmissionFileResponse,
+    openapi_extra=multipart_upload_openapi("document_type"),
+)
+async def upload_submission_file(
+    submission_id: int,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    # Ownership is checked before the body is read, so a rejected upload is never written.
+    submission = await run_in_threadpool(load_uploadable_submission, db, submission_id, current_user)
+    reader = MultipartUploadReader(
+        UPLOADS_DIR, SUBMISSION_FILE_MAX_BYTES, f"File must be <= {SUBMISSION_FILE_MAX_BYTES // (1024 * 1024)} MB"
+    )
+    upload = await reader.ingest(request, "submission_file", ("document_type",), content_addressed=True)
+    return await run_in_threadpool(store_submission_file, db, submission, reader, upload)
+
+
 @app.get("/api/files/{file_id}")
 def download_file(
     file_id: int,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -619,36 +2788,95 @@ def download_file(
     if not os.path.exists(stored_path):
         raise HTTPException(status_code=404, detail="File missing")
 
-    return FileResponse(
+    return stored_file_response(
+        request,
         stored_path,
         media_type=submission_file.mime_type,
         filename=submission_file.original_name,
+        content_hash=submission_file.blob_sha256,
+    )
+
+
+@app.get("/api/submissions/{submission_id}/letter")
+def download_letter(
+    submission_id: int,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    submission = db.scalar(
+        select(Submission).options(joinedload(Submission.owner)).where(Submission.id == submission_id)
+    )
+    if not submission:
+        raise HTTPException(status_code=404, detail="Submission not found")
+
+    if current_user.role != RoleEnum.ADMIN_RW and submission.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    if submission.status != SubmissionStatusEnum.APPROVED:
+        raise HTTPException(status_code=409, detail="Letter is only available for approved submissions")
+
+    path = letter_path(submission)
+    if not os.path.exists(path):
+        # Only a short wait on the request thread; the render keeps running in the pool and the
+        # client's retry after 202 picks up the finished file.
+        try:
+            submit_letter_render(submission, submission.owner).result(timeout=LETTER_RENDER_TIMEOUT_SECONDS)
+        except TimeoutError:
+            return JSONResponse(
+                {"detail": "Letter is being rendered, try again"}, status_code=202, headers={"Retry-After": "2"}
+            )
+
+    return stored_file_response(
+        request,
+        path,
+        media_type="application/pdf",
+        filename=f"{slugify(submission.type)}-{submission.id}.pdf",
+    )
+
+
+@app.get("/api/events")
+async def stream_events(request: Request, token: str = Query(...)):
+    # EventSource cannot send an Authorization header, so the access token comes as a query parameter.
+    user = await run_in_threadpool(authenticate_token, token)
+    if event_broker.full():
+        raise HTTPException(status_code=503, detail="Too many event streams", headers={"Retry-After": "5"})
+    key = "admin" if user.role == RoleEnum.ADMIN_RW else f"user:{user.id}"
+    return StreamingResponse(
+        event_stream(request, key),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
 @app.get("/api/announcements", response_model=list[AnnouncementListItem])
-def list_public_announcements(db: Session = Depends(get_db)):
-    announcements = db.scalars(
-        select(Announcement)
-        .where(Announcement.status == AnnouncementStatusEnum.PUBLISHED)
-        .order_by(Announcement.published_at.desc().nullslast(), Announcement.created_at.desc())
-    ).all()
-    return [serialize_announcement_list_item(item) for item in announcements]
+def list_public_announcements(request: Request, db: Session = Depends(get_db)):
+    version, cached = lookup_public_cache("list")
+    if cached is None:
+        rows = db.execute(public_announcements_query()).all()
+        cached = store_public_cache(version, "list", [serialize_announcement_list_item(row) for row in rows])
+    return public_cache_response(request, cached)
 
 
 @app.get("/api/announcements/{slug}", response_model=AnnouncementResponse)
-def get_public_announcement(slug: str, db: Session = Depends(get_db)):
-    announcement = db.scalar(
-        select(Announcement)
-        .where(Announcement.slug == slug, Announcement.status == AnnouncementStatusEnum.PUBLISHED)
-    )
-    if not announcement:
-        raise HTTPException(status_code=404, detail="Announcement not found")
-    return serialize_announcement(announcement)
+def get_public_announcement(slug: str, request: Request, db: Session = Depends(get_db)):
+    version, cached = lookup_public_cache(("slug", slug))
+    if cached is None:
+        announcement = db.scalar(public_announcement_query(slug))
+        if not announcement:
+            raise HTTPException(status_code=404, detail="Announcement not found")
+        cached = store_public_cache(version, ("slug", slug), serialize_announcement(announcement))
+    return public_cache_response(request, cached)
 
 
 @app.get("/api/announcements/{announcement_id}/cover")
-def get_announcement_cover(announcement_id: int, db: Session = Depends(get_db)):
+def get_announcement_cover(
+    announcement_id: int,
+    request: Request,
+    size: Literal["thumb", "card", "full"] | None = None,
+    format: Literal["webp", "jpeg"] | None = None,
+    db: Session = Depends(get_db),
+):
     announcement = db.scalar(select(Announcement).where(Announcement.id == announcement_id))
     if not announcement or not announcement.cover_stored_name:
         raise HTTPException(status_code=404, detail="Cover not found")
@@ -657,10 +2885,30 @@ def get_announcement_cover(announcement_id: int, db: Session = Depends(get_db)):
     if not os.path.exists(stored_path):
         raise HTTPException(status_code=404, detail="Cover missing")
 
-    return FileResponse(
+    if size:
+        fmt = format or ("webp" if "image/webp" in request.headers.get("accept", "") else "jpeg")
+        variant_path = os.path.join(ANNOUNCEMENTS_DIR, cover_variant_name(announcement.cover_stored_name, size, fmt))
+        if not os.path.exists(variant_path):
+            try:
+                # Only the requested variant; the cover.variants job renders the rest.
+                generate_cover_variants(announcement.cover_stored_name, announcement.cover_focus, (size,), (fmt,))
+            except OSError:
+                variant_path = None
+        if variant_path:
+            return stored_file_response(
+                request,
+                variant_path,
+                media_type=COVER_FORMATS[fmt][1],
+                headers={"Vary": "Accept"},
+                cache_control=COVER_CACHE_CONTROL,
+            )
+
+    return stored_file_response(
+        request,
         stored_path,
         media_type=announcement.cover_mime_type or "application/octet-stream",
         filename=announcement.cover_original_name or announcement.cover_stored_name,
+        cache_control=COVER_CACHE_CONTROL,
     )
 
 
@@ -672,24 +2920,8 @@ def admin_list_announcements(
     db: Session = Depends(get_db),
 ):
     require_admin(current_user)
-    query = select(Announcement, User).outerjoin(User, User.id == Announcement.author_user_id)
-    if status:
-        query = query.where(Announcement.status == status)
-    if q:
-        like = f"%{q}%"
-        query = query.where(
-            or_(
-                Announcement.title.ilike(like),
-                Announcement.excerpt.ilike(like),
-                Announcement.category.ilike(like),
-                Announcement.slug.ilike(like),
-            )
-        )
-    rows = db.execute(query.order_by(Announcement.updated_at.desc())).all()
-    items = []
-    for announcement, author in rows:
-        items.append(serialize_announcement_list_item(announcement, author.full_name if author else None))
-    return items
+    rows = db.execute(admin_announcements_query(status, q)).all()
+    return list_json_response([serialize_announcement_list_item(row, row.author_name) for row in rows])
 
 
 @app.get("/api/admin/announcements/{announcement_id}", response_model=AnnouncementResponse)
@@ -699,11 +2931,10 @@ def admin_get_announcement(
     db: Session = Depends(get_db),
 ):
     require_admin(current_user)
-    announcement = db.scalar(select(Announcement).where(Announcement.id == announcement_id))
+    announcement = db.scalar(admin_announcement_query(announcement_id))
     if not announcement:
         raise HTTPException(status_code=404, detail="Announcement not found")
-    author = db.scalar(select(User).where(User.id == announcement.author_user_id))
-    return serialize_announcement(announcement, author.full_name if author else None)
+    return serialize_announcement(announcement, announcement_author_name(announcement))
 
 
 @app.post("/api/admin/announcements", response_model=AnnouncementResponse)
@@ -731,6 +2962,7 @@ def admin_create_announcement(
         created_at=now,
         updated_at=now,
     )
+    announcement.search_text = build_announcement_search_text(announcement)
     db.add(announcement)
     db.commit()
     db.refresh(announcement)
@@ -764,6 +2996,11 @@ def admin_update_announcement(
         announcement.category = payload.category
     if payload.content is not None:
         announcement.content = payload.content
+    refocus_cover = bool(
+        announcement.cover_stored_name
+        and payload.cover_focus is not None
+        and payload.cover_focus != announcement.cover_focus
+    )
     if payload.cover_focus is not None:
         announcement.cover_focus = payload.cover_focus
     if payload.status is not None:
@@ -773,54 +3010,75 @@ def admin_update_announcement(
         else:
             announcement.published_at = None
 
+    announcement.search_text = build_announcement_search_text(announcement)
     announcement.updated_at = datetime.utcnow()
+    if refocus_cover:
+        enqueue_cover_variants(db, announcement)
     db.commit()
-    db.refresh(announcement)
-    author = db.scalar(select(User).where(User.id == announcement.author_user_id))
-    return serialize_announcement(announcement, author.full_name if author else None)
+    if refocus_cover:
+        remove_cover_variants(announcement.cover_stored_name)
+    announcement = db.scalar(admin_announcement_query(announcement_id))
+    return serialize_announcement(announcement, announcement_author_name(announcement))
 
 
-@app.post("/api/admin/announcements/{announcement_id}/cover", response_model=AnnouncementResponse)
-def admin_upload_announcement_cover(
-    announcement_id: int,
-    file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
-    require_admin(current_user)
+def load_cover_announcement(db: Session, announcement_id: int) -> Announcement:
     announcement = db.scalar(select(Announcement).where(Announcement.id == announcement_id))
     if not announcement:
         raise HTTPException(status_code=404, detail="Announcement not found")
-    if not (file.content_type or "").startswith("image/"):
-        raise HTTPException(status_code=400, detail="File must be an image")
-
     ensure_announcements_dir()
-    extension = os.path.splitext(file.filename or "")[1]
-    stored_name = f"{uuid4().hex}{extension}"
-    stored_path = os.path.join(ANNOUNCEMENTS_DIR, stored_name)
+    return announcement
 
-    with open(stored_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
 
-    size_bytes = os.path.getsize(stored_path)
-    if size_bytes > 2 * 1024 * 1024:
-        os.remove(stored_path)
-        raise HTTPException(status_code=400, detail="Image must be <= 2 MB")
+def store_announcement_cover(
+    db: Session, announcement: Announcement, filename: str | None, upload: IngestedUpload
+) -> AnnouncementResponse:
+    stored_name = upload.stored_name
+    if not upload.mime_type.startswith("image/"):
+        remove_cover_files(stored_name)
+        raise HTTPException(status_code=400, detail="File must be an image")
+
+    try:
+        verify_cover_image(stored_name)
+    except (OSError, SyntaxError, Image.DecompressionBombError):
+        remove_cover_files(stored_name)
+        raise HTTPException(status_code=400, detail="Unsupported image format")
 
     if announcement.cover_stored_name:
-        old_path = os.path.join(ANNOUNCEMENTS_DIR, announcement.cover_stored_name)
-        if os.path.exists(old_path):
-            os.remove(old_path)
+        remove_cover_files(announcement.cover_stored_name)
 
-    announcement.cover_original_name = file.filename or stored_name
+    announcement.cover_original_name = filename or stored_name
     announcement.cover_stored_name = stored_name
-    announcement.cover_mime_type = file.content_type or "application/octet-stream"
-    announcement.cover_size_bytes = size_bytes
+    announcement.cover_mime_type = upload.mime_type
+    announcement.cover_size_bytes = upload.size_bytes
     announcement.updated_at = datetime.utcnow()
+    enqueue_cover_variants(db, announcement)
     db.commit()
-    db.refresh(announcement)
-    author = db.scalar(select(User).where(User.id == announcement.author_user_id))
-    return serialize_announcement(announcement, author.full_name if author else None)
+    announcement = db.scalar(admin_announcement_query(announcement.id))
+    return serialize_announcement(announcement, announcement_author_name(announcement))
+
+
+@app.post(
+    "/api/admin/announcements/{announcement_id}/cover",
+    response_model=AnnouncementResponse,
+    openapi_extra=multipart_upload_openapi(),
+)
+async def admin_upload_announcement_cover(
+    announcement_id: int,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    require_admin(current_user)
+    announcement = await run_in_threadpool(load_cover_announcement, db, announcement_id)
+    reader = MultipartUploadReader(
+        ANNOUNCEMENTS_DIR,
+        COVER_MAX_BYTES,
+        "Image must be <= 2 MB",
+        content_type_prefix="image/",
+        content_type_detail="File must be an image",
+    )
+    upload = await reader.ingest(request, "announcement_cover")
+    return await run_in_threadpool(store_announcement_cover, db, announcement, reader.filename, upload)
 
 
 @app.delete("/api/admin/announcements/{announcement_id}/cover", response_model=AnnouncementResponse)
@@ -835,9 +3093,7 @@ def admin_remove_announcement_cover(
         raise HTTPException(status_code=404, detail="Announcement not found")
 
     if announcement.cover_stored_name:
-        stored_path = os.path.join(ANNOUNCEMENTS_DIR, announcement.cover_stored_name)
-        if os.path.exists(stored_path):
-            os.remove(stored_path)
+        remove_cover_files(announcement.cover_stored_name)
 
     announcement.cover_original_name = None
     announcement.cover_stored_name = None
@@ -845,58 +3101,92 @@ def admin_remove_announcement_cover(
     announcement.cover_size_bytes = None
     announcement.updated_at = datetime.utcnow()
     db.commit()
-    db.refresh(announcement)
-    author = db.scalar(select(User).where(User.id == announcement.author_user_id))
-    return serialize_announcement(announcement, author.full_name if author else None)
+    announcement = db.scalar(admin_announcement_query(announcement_id))
+    return serialize_announcement(announcement, announcement_author_name(announcement))
 
 
-@app.get("/api/admin/submissions", response_model=list[AdminSubmissionListItem])
-def admin_list_submissions(
+@app.get("/api/admin/cache-stats")
+def admin_cache_stats(current_user: User = Depends(get_current_user)):
+    require_admin(current_user)
+    return {"principals": principal_cache.stats(), "public_announcements": public_cache.stats()}
+
+
+@app.get("/api/admin/jobs/stats")
+def admin_job_stats(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    require_admin(current_user)
+    return job_stats(db)
+
+
+@app.get("/api/admin/reports", response_model=ReportResponse)
+def admin_report(
+    period: str = Query(..., description="YYYY or YYYY-MM"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    require_admin(current_user)
+    rolled_through = refresh_daily_rollups(db)
+    return build_report(db, period, rolled_through)
+
+
+@app.post("/api/admin/reports/rollup")
+def admin_refresh_rollups(
+    rebuild: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    require_admin(current_user)
+    rolled_through = rebuild_daily_rollups(db) if rebuild else refresh_daily_rollups(db)
+    return {"rolled_through": rolled_through}
+
+
+@app.get("/api/admin/submissions/stats", response_model=SubmissionStatsResponse)
+def admin_submission_stats(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    require_admin(current_user)
+    return build_submission_stats(db.scalars(select(SubmissionCounter)).all())
+
+
+@app.post("/api/admin/submissions/stats/reconcile")
+def admin_reconcile_submission_stats(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    require_admin(current_user)
+    return reconcile_submission_counters(db)
+
+
+@app.get("/api/admin/submissions/export")
+def admin_export_submissions(
+    format: Literal["csv", "ndjson"] = "csv",
     status: SubmissionStatusEnum | None = None,
     type: str | None = None,
     q: str | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
 ):
     require_admin(current_user)
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+    filters = admin_submission_filters(status, type, q, date_from, date_to)
+    media_type = "text/csv; charset=utf-8" if format == "csv" else "application/x-ndjson"
+    filename = f"submissions-{datetime.utcnow():%Y%m%d%H%M%S}.{format}"
+    return StreamingResponse(
+        export_submissions(filters, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "X-Accel-Buffering": "no"},
+    )
 
-    query = select(Submission, User).join(User, User.id == Submission.user_id)
 
-    if status:
-        query = query.where(Submission.status == status)
-    if type:
-        query = query.where(Submission.type == type)
-    if q:
-        like = f"%{q}%"
-        query = query.where(
-            or_(
-                User.email.ilike(like),
-                User.full_name.ilike(like),
-                User.nik.ilike(like),
-                Submission.type.ilike(like),
-                cast(Submission.payload, String).ilike(like),
-            )
-        )
-
-    rows = db.execute(query.order_by(Submission.created_at.desc())).all()
-    items = []
-    for submission, owner in rows:
-        items.append(
-            AdminSubmissionListItem(
-                id=submission.id,
-                user_id=submission.user_id,
-                owner_email=owner.email,
-                owner_full_name=owner.full_name,
-                owner_phone_number=owner.phone_number,
-                owner_nik=owner.nik,
-                owner_kk_number=owner.kk_number,
-                type=submission.type,
-                status=submission.status,
-                created_at=submission.created_at,
-                updated_at=submission.updated_at,
-            )
-        )
-    return items
+@app.get("/api/admin/submissions", response_model=AdminSubmissionPage)
+def admin_list_submissions(
+    status: SubmissionStatusEnum | None = None,
+    type: str | None = None,
+    q: str | None = None,
+    cursor: str | None = None,
+    limit: int = Query(ADMIN_PAGE_SIZE_DEFAULT, ge=1, le=ADMIN_PAGE_SIZE_MAX),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    require_admin(current_user)
+    rows = db.execute(admin_submissions_query(status, type, q, cursor, limit)).all()
+    return build_admin_submission_page(rows, limit)
 
 
 @app.get("/api/admin/submissions/{submission_id}", response_model=AdminSubmissionDetailResponse)
@@ -907,26 +3197,11 @@ def admin_submission_detail(
 ):
     require_admin(current_user)
 
-    submission = db.scalar(select(Submission).where(Submission.id == submission_id))
+    submission = db.execute(submission_detail_query(submission_id, with_owner=True)).unique().scalar_one_or_none()
     if not submission:
         raise HTTPException(status_code=404, detail="Submission not found")
 
-    owner = db.scalar(select(User).where(User.id == submission.user_id))
-    files = db.scalars(select(SubmissionFile).where(SubmissionFile.submission_id == submission_id)).all()
-    logs = db.scalars(
-        select(ApprovalLog).where(ApprovalLog.submission_id == submission_id).order_by(ApprovalLog.created_at.desc())
-    ).all()
-
-    return AdminSubmissionDetailResponse(
-        **SubmissionResponse.model_validate(submission).model_dump(),
-        owner_email=owner.email if owner else "",
-        owner_full_name=owner.full_name if owner else None,
-        owner_phone_number=owner.phone_number if owner else None,
-        owner_nik=owner.nik if owner else None,
-        owner_kk_number=owner.kk_number if owner else None,
-        files=[SubmissionFileResponse.model_validate(file) for file in files],
-        logs=[ApprovalLogResponse.model_validate(log) for log in logs],
-    )
+    return build_admin_submission_detail(submission)
 
 
 @app.post("/api/submissions/{submission_id}/actions", response_model=SubmissionActionResponse)
@@ -938,11 +3213,14 @@ def submission_action(
 ):
     require_admin(current_user)
 
-    submission = db.scalar(select(Submission).where(Submission.id == submission_id))
+    # Locked like bulk_submission_action: concurrent actions must not apply the same old -> new counter delta twice.
+    submission = db.scalar(select(Submission).where(Submission.id == submission_id).with_for_update())
     if not submission:
         raise HTTPException(status_code=404, detail="Submission not found")
 
-    submission.status = map_action_to_status(payload.action)
+    new_status = map_action_to_status(payload.action)
+    record_status_change(db, submission.type, submission.status, new_status)
+    submission.status = new_status
     submission.updated_at = datetime.utcnow()
 
     log_entry = ApprovalLog(
@@ -952,6 +3230,23 @@ def submission_action(
         note=payload.note,
     )
     db.add(log_entry)
+    db.flush()
+    if new_status == SubmissionStatusEnum.APPROVED:
+        enqueue_job(db, "letter.render", {"submission_id": submission.id})
+    notify_submission_events(
+        db,
+        [
+            submission_event(
+                "submission.status",
+                submission.id,
+                submission.user_id,
+                submission.type,
+                new_status,
+                payload.action,
+                log_entry.id,
+            )
+        ],
+    )
     db.commit()
     db.refresh(log_entry)
 
@@ -959,3 +3254,100 @@ def submission_action(
         submission=SubmissionResponse.model_validate(submission),
         log=ApprovalLogResponse.model_validate(log_entry),
     )
+
+
+@app.post("/api/admin/submissions/actions:bulk", response_model=BulkSubmissionActionResponse)
+def bulk_submission_action(
+    payload: BulkSubmissionActionRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    require_admin(current_user)
+
+    submission_ids = list(dict.fromkeys(payload.submission_ids))
+    new_status = map_action_to_status(payload.action)
+    now = datetime.utcnow()
+    rows = db.execute(
+        select(Submission.id, Submission.user_id, Submission.type, Submission.status)
+        .where(Submission.id.in_(submission_ids))
+        .order_by(Submission.id)
+        .with_for_update()
+    ).all()
+    found = {row.id: row for row in rows}
+
+    log_ids = {}
+    if found:
+        db.execute(
+            update(Submission)
+            .where(Submission.id.in_(found))
+            .values(status=new_status, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        inserted = db.execute(
+            insert(ApprovalLog).returning(ApprovalLog.id, ApprovalLog.submission_id),
+            [
+                {
+                    "submission_id": submission_id,
+                    "actor_user_id": current_user.id,
+                    "action": payload.action,
+                    "note": payload.note,
+                    "created_at": now,
+                }
+                for submission_id in found
+            ],
+        )
+        log_ids = {submission_id: log_id for log_id, submission_id in inserted}
+
+        changes: dict[tuple[str, SubmissionStatusEnum], int] = {}
+        for row in rows:
+            if row.status != new_status:
+                changes[(row.type, row.status)] = changes.get((row.type, row.status), 0) - 1
+                changes[(row.type, new_status)] = changes.get((row.type, new_status), 0) + 1
+        adjust_submission_counters(db, changes)
+        if new_status == SubmissionStatusEnum.APPROVED:
+            enqueue_jobs(db, "letter.render", [{"submission_id": submission_id} for submission_id in found])
+        notify_submission_events(
+            db,
+            [
+                submission_event(
+                    "submission.status",
+                    row.id,
+                    row.user_id,
+                    row.type,
+                    new_status,
+                    payload.action,
+                    log_ids.get(row.id),
+                )
+                for row in rows
+            ],
+        )
+    db.commit()
+
+    results = [
+        BulkSubmissionActionResult(
+            submission_id=submission_id,
+            ok=True,
+            previous_status=found[submission_id].status,
+            log_id=log_ids.get(submission_id),
+        )
+        if submission_id in found
+        else BulkSubmissionActionResult(submission_id=submission_id, ok=False, detail="Submission not found")
+        for submission_id in submission_ids
+    ]
+    return BulkSubmissionActionResponse(action=payload.action, status=new_status, updated=len(found), results=results)
+
+
+def mount_async_routes() -> None:
+    from async_api import router as async_router
+
+    replaced = {(route.path, method) for route in async_router.routes for method in route.methods}
+    app.router.routes = [
+        route
+        for route in app.router.routes
+        if not (isinstance(route, APIRoute) and any((route.path, method) in replaced for method in route.methods))
+    ]
+    app.include_router(async_router)
+
+
+if DB_MODE == "async":
+    mount_async_routes()
@@ -0,0 +1,197 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import passwords
+from app import (
+    ADMIN_PAGE_SIZE_DEFAULT,
+    ADMIN_PAGE_SIZE_MAX,
+    AdminSubmissionDetailResponse,
+    AdminSubmissionPage,
+    AnnouncementListItem,
+    AnnouncementResponse,
+    AnnouncementStatusEnum,
+    LoginRequest,
+    RoleEnum,
+    SubmissionDetailResponse,
+    SubmissionResponse,
+    SubmissionStatusEnum,
+    TokenResponse,
+    User,
+    UserResponse,
+    admin_announcement_query,
+    admin_announcements_query,
+    admin_submissions_query,
+    announcement_author_name,
+    build_admin_submission_detail,
+    build_admin_submission_page,
+    build_submission_detail,
+    cache_principal,
+    create_access_token,
+    decode_access_token,
+    get_async_db,
+    list_json_response,
+    lookup_public_cache,
+    own_submissions_query,
+    principal_cache,
+    public_announcement_query,
+    public_announcements_query,
+    public_cache_response,
+    require_admin,
+    security,
+    serialize_announcement,
+    serialize_announcement_list_item,
+    store_public_cache,
+    submission_detail_query,
+    submit_password_job,
+)
+
+router = APIRouter()
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    user_id = decode_access_token(credentials)
+    principal = principal_cache.get(user_id)
+    if principal:
+        return principal
+
+    user = await db.scalar(select(User).where(User.id == user_id))
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    return cache_principal(user)
+
+
+@router.post("/api/auth/login", response_model=TokenResponse)
+async def login(payload: LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    user = await db.scalar(select(User).where(User.email == payload.email))
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    valid, new_hash = await asyncio.wrap_future(
+        submit_password_job(passwords.verify_and_update, payload.password, user.hashed_password)
+    )
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+
+    token = create_access_token(user.id)
+    return TokenResponse(access_token=token)
+
+
+@router.get("/api/auth/me", response_model=UserResponse)
+async def me(current_user: User = Depends(get_current_user)):
+    return current_user
+
+
+@router.get("/api/submissions", response_model=list[SubmissionResponse])
+async def list_own_submissions(
+    status: SubmissionStatusEnum | None = None,
+    type: str | None = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    if current_user.role != RoleEnum.WARGA:
+        raise HTTPException(status_code=403, detail="Warga only")
+
+    submissions = (await db.scalars(own_submissions_query(current_user.id, status, type))).all()
+    return list(submissions)
+
+
+@router.get("/api/submissions/{submission_id}", response_model=SubmissionDetailResponse)
+async def get_submission_detail(
+    submission_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    submission = (await db.execute(submission_detail_query(submission_id))).unique().scalar_one_or_none()
+    if not submission:
+        raise HTTPException(status_code=404, detail="Submission not found")
+
+    if submission.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    return build_submission_detail(submission)
+
+
+@router.get("/api/announcements", response_model=list[AnnouncementListItem])
+async def list_public_announcements(request: Request, db: AsyncSession = Depends(get_async_db)):
+    version, cached = lookup_public_cache("list")
+    if cached is None:
+        rows = (await db.execute(public_announcements_query())).all()
+        cached = store_public_cache(version, "list", [serialize_announcement_list_item(row) for row in rows])
+    return public_cache_response(request, cached)
+
+
+@router.get("/api/announcements/{slug}", response_model=AnnouncementResponse)
+async def get_public_announcement(slug: str, request: Request, db: AsyncSession = Depends(get_async_db)):
+    version, cached = lookup_public_cache(("slug", slug))
+    if cached is None:
+        announcement = await db.scalar(public_announcement_query(slug))
+        if not announcement:
+            raise HTTPException(status_code=404, detail="Announcement not found")
+        cached = store_public_cache(version, ("slug", slug), serialize_announcement(announcement))
+    return public_cache_response(request, cached)
+
+
+@router.get("/api/admin/announcements", response_model=list[AnnouncementListItem])
+async def admin_list_announcements(
+    status: AnnouncementStatusEnum | None = None,
+    q: str | None = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    require_admin(current_user)
+    rows = (await db.execute(admin_announcements_query(status, q))).all()
+    return list_json_response([serialize_announcement_list_item(row, row.author_name) for row in rows])
+
+
+@router.get("/api/admin/announcements/{announcement_id}", response_model=AnnouncementResponse)
+async def admin_get_announcement(
+    announcement_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    require_admin(current_user)
+    announcement = await db.scalar(admin_announcement_query(announcement_id))
+    if not announcement:
+        raise HTTPException(status_code=404, detail="Announcement not found")
+    return serialize_announcement(announcement, announcement_author_name(announcement))
+
+
+@router.get("/api/admin/submissions", response_model=AdminSubmissionPage)
+async def admin_list_submissions(
+    status: SubmissionStatusEnum | None = None,
+    type: str | None = None,
+    q: str | None = None,
+    cursor: str | None = None,
+    limit: int = Query(ADMIN_PAGE_SIZE_DEFAULT, ge=1, le=ADMIN_PAGE_SIZE_MAX),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    require_admin(current_user)
+    rows = (await db.execute(admin_submissions_query(status, type, q, cursor, limit))).all()
+    return build_admin_submission_page(rows, limit)
+
+
+@router.get("/api/admin/submissions/{submission_id}", response_model=AdminSubmissionDetailResponse)
+async def admin_submission_detail(
+    submission_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    require_admin(current_user)
+
+    query = submission_detail_query(submission_id, with_owner=True)
+    submission = (await db.execute(query)).unique().scalar_one_or_none()
+    if not submission:
+        raise HTTPException(status_code=404, detail="Submission not found")
+
+    return build_admin_submission_detail(submission)
@@ -0,0 +1,42 @@
+import math
+
+LETTER_TYPES = [
+    "Surat Pengantar KTP",
+    "Surat Pengantar KK",
+    "Surat Pengantar Domisili",
+    "Surat Pengantar SKCK",
+    "Surat Pengantar Nikah",
+    "Surat Pengantar Usaha (UMKM)",
+    "Surat Pengantar Tidak Mampu",
+]
+BENCH_EMAIL_DOMAIN = "bench.example.com"
+BENCH_PASSWORD = "bench-password"
+
+
+def warga_email(index: int) -> str:
+    return f"warga{index}@{BENCH_EMAIL_DOMAIN}"
+
+
+def admin_email(index: int) -> str:
+    return f"admin{index}@{BENCH_EMAIL_DOMAIN}"
+
+
+def percentile(sorted_values: list[float], quantile: float) -> float:
+    # Nearest-rank, so every reported value is one that was actually observed.
+    if not sorted_values:
+        return math.nan
+    rank = max(1, math.ceil(quantile * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def format_table(headers: list[str], rows: list[list]) -> str:
+    cells = [headers] + [[str(cell) for cell in row] for row in rows]
+    widths = [max(len(row[column]) for row in cells) for column in range(len(headers))]
+    lines = []
+    for index, row in enumerate(cells):
+        # First column (the name) is left-aligned, numbers are right-aligned.
+        padded = [row[0].ljust(widths[0])] + [cell.rjust(width) for cell, width in zip(row[1:], widths[1:])]
+        lines.append("  ".join(padded))
+        if index == 0:
+            lines.append("  ".join("-" * width for width in widths))
+    return "\n".join(lines)
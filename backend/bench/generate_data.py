@@ -0,0 +1,301 @@
+"""Fill a local database with synthetic RW data for benchmarking.
+
+Run from backend/ against a disposable database (it writes straight into DATABASE_URL):
+
+    python -m bench.generate_data --users 5000 --submissions 200000
+"""
+import argparse
+from datetime import datetime, timedelta
+import random
+import time
+from types import SimpleNamespace
+
+from sqlalchemy import func, insert, select, text
+
+from app import (
+    Announcement,
+    AnnouncementStatusEnum,
+    ApprovalLog,
+    RoleEnum,
+    SessionLocal,
+    Submission,
+    SubmissionActionEnum,
+    SubmissionStatusEnum,
+    User,
+    add_months,
+    approval_log_partitions,
+    build_announcement_search_text,
+    build_submission_search_text,
+    day_start,
+    engine,
+    hash_password,
+    month_start,
+    rebuild_daily_rollups,
+    reconcile_submission_counters,
+    shutdown_hash_pool,
+    slugify,
+)
+from bench.common import BENCH_EMAIL_DOMAIN, BENCH_PASSWORD, LETTER_TYPES, admin_email, warga_email
+from letters import MONTHS_ID
+
+FIRST_NAMES = "Budi Siti Agus Dewi Rudi Sri Andi Rina Joko Wati Ahmad Nur Yusuf Fitri Hendra Lestari Eko Ayu".split()
+LAST_NAMES = "Santoso Wijaya Saputra Rahayu Hidayat Kurniawan Pratama Susanti Setiawan Nugroho Lubis Siregar".split()
+NOTES_BY_TYPE = {
+    "Surat Pengantar KTP": ["Perpanjangan KTP", "KTP hilang", "Pembuatan KTP pertama", "Perubahan data KTP"],
+    "Surat Pengantar KK": ["Penambahan anggota keluarga", "Pisah KK", "Perubahan alamat", "KK rusak"],
+    "Surat Pengantar Domisili": ["Syarat melamar kerja", "Pembukaan rekening bank", "Pendaftaran sekolah anak"],
+    "Surat Pengantar SKCK": ["Melamar pekerjaan", "Pendaftaran CPNS", "Persyaratan visa kerja"],
+    "Surat Pengantar Nikah": ["Rencana menikah bulan depan", "Pengurusan N1-N4 di kelurahan"],
+    "Surat Pengantar Usaha (UMKM)": ["Usaha warung makan", "Usaha laundry kiloan", "Usaha jahit", "Toko kelontong"],
+    "Surat Pengantar Tidak Mampu": ["Keringanan biaya sekolah", "Pengajuan bantuan kesehatan", "Beasiswa anak"],
+}
+REQUIREMENTS_BY_TYPE = {
+    "Surat Pengantar KTP": ["Fotokopi Kartu Keluarga", "Fotokopi KTP lama (jika ada)"],
+    "Surat Pengantar KK": [
+        "Fotokopi KTP kepala keluarga",
+        "Fotokopi KK lama",
+        "Surat keterangan perubahan (lahir/meninggal/pindah) jika ada",
+    ],
+    "Surat Pengantar Domisili": ["Fotokopi KTP", "Fotokopi KK", "Surat pernyataan domisili (opsional)"],
+    "Surat Pengantar SKCK": ["Fotokopi KTP", "Fotokopi KK", "Pas foto (opsional)"],
+    "Surat Pengantar Nikah": ["Fotokopi KTP calon", "Fotokopi KK", "Surat pengantar RT (opsional)"],
+    "Surat Pengantar Usaha (UMKM)": ["Fotokopi KTP", "Fotokopi KK", "Surat pernyataan usaha sederhana"],
+    "Surat Pengantar Tidak Mampu": ["Fotokopi KTP", "Fotokopi KK", "Surat keterangan tidak mampu (opsional)"],
+}
+TYPE_WEIGHTS = [30, 20, 20, 12, 5, 8, 5]
+STATUS_WEIGHTS = {
+    SubmissionStatusEnum.SUBMITTED: 10,
+    SubmissionStatusEnum.IN_REVIEW: 10,
+    SubmissionStatusEnum.NEED_REVISION: 5,
+    SubmissionStatusEnum.APPROVED: 65,
+    SubmissionStatusEnum.REJECTED: 10,
+}
+FINAL_ACTION = {
+    SubmissionStatusEnum.NEED_REVISION: SubmissionActionEnum.REQUEST_REVISION,
+    SubmissionStatusEnum.APPROVED: SubmissionActionEnum.APPROVE,
+    SubmissionStatusEnum.REJECTED: SubmissionActionEnum.REJECT,
+}
+ANNOUNCEMENT_TOPICS = [
+    "Kerja Bakti",
+    "Posyandu Balita",
+    "Ronda Malam",
+    "Iuran Kebersihan",
+    "Fogging Demam Berdarah",
+    "Lomba Tujuh Belasan",
+    "Pemadaman Listrik",
+    "Vaksinasi",
+    "Pengajian Rutin",
+    "Rapat Warga",
+]
+ANNOUNCEMENT_CATEGORIES = ["Informasi", "Kegiatan", "Kesehatan", "Keamanan", "Keuangan"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=5000, help="warga accounts")
+    parser.add_argument("--admins", type=int, default=3)
+    parser.add_argument("--submissions", type=int, default=200000)
+    parser.add_argument("--announcements", type=int, default=300)
+    parser.add_argument("--months", type=int, default=24, help="spread created_at over this many past months")
+    parser.add_argument("--batch", type=int, default=5000, help="rows per INSERT batch")
+    parser.add_argument("--seed", type=int, default=20240817)
+    return parser.parse_args()
+
+
+def random_moment(rng: random.Random, since: datetime, until: datetime) -> datetime:
+    return since + timedelta(seconds=rng.uniform(0, (until - since).total_seconds()))
+
+
+def create_users(db, rng: random.Random, args: argparse.Namespace) -> tuple[list[SimpleNamespace], list[int]]:
+    # One hash shared by every bench account: hashing thousands at the production cost would take hours.
+    hashed_password = hash_password(BENCH_PASSWORD)
+    now = datetime.utcnow()
+    rows = []
+    for index in range(args.admins):
+        rows.append(
+            {
+                "email": admin_email(index),
+                "hashed_password": hashed_password,
+                "role": RoleEnum.ADMIN_RW,
+                "full_name": f"Pengurus RW {index + 1}",
+                "phone_number": None,
+                "nik": None,
+                "kk_number": None,
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+    for index in range(args.users):
+        rows.append(
+            {
+                "email": warga_email(index),
+                "hashed_password": hashed_password,
+                "role": RoleEnum.WARGA,
+                "full_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "phone_number": f"08{rng.randrange(10**9, 10**10)}",
+                "nik": f"{rng.randrange(10**15, 10**16)}",
+                "kk_number": f"{rng.randrange(10**15, 10**16)}",
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+    ids = db.scalars(insert(User).returning(User.id, sort_by_parameter_order=True), rows).all()
+    db.commit()
+    admin_ids = ids[: args.admins]
+    wargas = [SimpleNamespace(id=user_id, **row) for user_id, row in zip(ids[args.admins :], rows[args.admins :])]
+    return wargas, admin_ids
+
+
+def ensure_history_partitions(db, since: datetime) -> None:
+    # Maintenance only creates current and future months; history needs its own partitions so it
+    # does not all land in approval_logs_default.
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    existing = approval_log_partitions(db)
+    month = month_start(since.date())
+    while month <= month_start(datetime.utcnow().date()):
+        name = f"approval_logs_p{month:%Y%m}"
+        if name not in existing:
+            lower, upper = day_start(month), day_start(add_months(month, 1))
+            db.execute(
+                text(f"CREATE TABLE {name} PARTITION OF approval_logs FOR VALUES FROM ('{lower}') TO ('{upper}')")
+            )
+        month = add_months(month, 1)
+    db.commit()
+
+
+def build_submission(rng: random.Random, owner: SimpleNamespace, since: datetime, now: datetime) -> dict:
+    submission_type = rng.choices(LETTER_TYPES, TYPE_WEIGHTS)[0]
+    status = rng.choices(list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values()))[0]
+    created_at = random_moment(rng, since, now)
+    payload = {"note": rng.choice(NOTES_BY_TYPE[submission_type]), "checklist": REQUIREMENTS_BY_TYPE[submission_type]}
+    row = {
+        "user_id": owner.id,
+        "type": submission_type,
+        "payload": payload,
+        "status": status,
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+    row["search_text"] = build_submission_search_text(SimpleNamespace(**row), owner)
+    return row
+
+
+def build_logs(rng: random.Random, row: dict, admin_ids: list[int], now: datetime) -> list[dict]:
+    # submission_id is filled in once the submission rows are inserted.
+    status = row["status"]
+    if status == SubmissionStatusEnum.SUBMITTED:
+        return []
+    reviewed_at = min(now, row["created_at"] + timedelta(hours=rng.expovariate(1 / 6)))
+    logs = [
+        {
+            "actor_user_id": rng.choice(admin_ids),
+            "action": SubmissionActionEnum.SET_IN_REVIEW,
+            "note": None,
+            "created_at": reviewed_at,
+        }
+    ]
+    if status in FINAL_ACTION:
+        decided_at = min(now, reviewed_at + timedelta(hours=rng.expovariate(1 / 30)))
+        logs.append(
+            {
+                "actor_user_id": rng.choice(admin_ids),
+                "action": FINAL_ACTION[status],
+                "note": "Mohon lengkapi berkas" if status == SubmissionStatusEnum.NEED_REVISION else None,
+                "created_at": decided_at,
+            }
+        )
+    row["updated_at"] = logs[-1]["created_at"]
+    return logs
+
+
+def create_submissions(db, rng, wargas, admin_ids, args) -> int:
+    now = datetime.utcnow()
+    since = now - timedelta(days=30 * args.months)
+    ensure_history_partitions(db, since)
+    # A few active households file most letters, like the real data.
+    owner_weights = [rng.paretovariate(1.5) for _ in wargas]
+    created = 0
+    while created < args.submissions:
+        size = min(args.batch, args.submissions - created)
+        owners = rng.choices(wargas, owner_weights, k=size)
+        rows = [build_submission(rng, owner, since, now) for owner in owners]
+        # The last log sets updated_at, so logs are built before the submissions are inserted.
+        logs_by_row = [build_logs(rng, row, admin_ids, now) for row in rows]
+        ids = db.scalars(insert(Submission).returning(Submission.id, sort_by_parameter_order=True), rows).all()
+        logs = [
+            {"submission_id": submission_id, **log}
+            for submission_id, row_logs in zip(ids, logs_by_row)
+            for log in row_logs
+        ]
+        if logs:
+            db.execute(insert(ApprovalLog), logs)
+        db.commit()
+        created += size
+        print(f"  submissions {created}/{args.submissions}", flush=True)
+    return created
+
+
+def create_announcements(db, rng, admin_ids, args) -> None:
+    now = datetime.utcnow()
+    since = now - timedelta(days=30 * args.months)
+    rows = []
+    for index in range(args.announcements):
+        topic = rng.choice(ANNOUNCEMENT_TOPICS)
+        created_at = random_moment(rng, since, now)
+        status = AnnouncementStatusEnum.PUBLISHED if rng.random() < 0.85 else AnnouncementStatusEnum.DRAFT
+        title = f"{topic} {MONTHS_ID[created_at.month - 1]} {created_at.year}"
+        paragraphs = [
+            f"Diberitahukan kepada seluruh warga mengenai {topic.lower()} yang akan dilaksanakan di lingkungan RW.",
+            "Mohon kehadiran dan partisipasi bapak/ibu sekalian.",
+            "Informasi lebih lanjut dapat ditanyakan kepada pengurus RT masing-masing.",
+        ] * rng.randint(1, 4)
+        row = {
+            "slug": f"{slugify(title)}-{index}",
+            "title": title,
+            "excerpt": paragraphs[0],
+            "category": rng.choice(ANNOUNCEMENT_CATEGORIES),
+            "content": f"# {title}\n\n" + "\n\n".join(paragraphs),
+            "status": status,
+            "cover_focus": "center",
+            "author_user_id": rng.choice(admin_ids),
+            "published_at": created_at if status == AnnouncementStatusEnum.PUBLISHED else None,
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+        row["search_text"] = build_announcement_search_text(SimpleNamespace(**row))
+        rows.append(row)
+    if rows:
+        db.execute(insert(Announcement), rows)
+    db.commit()
+
+
+def main() -> None:
+    args = parse_args()
+    rng = random.Random(args.seed)
+    started = time.monotonic()
+    with SessionLocal() as db:
+        existing = db.scalar(select(func.count()).where(User.email.like(f"%@{BENCH_EMAIL_DOMAIN}")))
+        if existing:
+            raise SystemExit(f"{existing} bench users already exist; use a fresh database")
+
+        print(f"users: {args.users} warga, {args.admins} admin", flush=True)
+        wargas, admin_ids = create_users(db, rng, args)
+        print(f"submissions: {args.submissions}", flush=True)
+        create_submissions(db, rng, wargas, admin_ids, args)
+        print(f"announcements: {args.announcements}", flush=True)
+        create_announcements(db, rng, admin_ids, args)
+
+        print("counters and rollups", flush=True)
+        reconcile_submission_counters(db)
+        rebuild_daily_rollups(db)
+    shutdown_hash_pool()
+
+    if engine.dialect.name == "postgresql":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("VACUUM ANALYZE"))
+    print(f"done in {time.monotonic() - started:.1f}s; log in as {admin_email(0)} / {BENCH_PASSWORD}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""Scripted load against a running API, reporting latency percentiles per endpoint.
+
+Seed the database with bench.generate_data first, start the API, then from backend/:
+
+    python -m bench.load_test --base-url http://localhost:8000 --concurrency 8 --duration 60
+"""
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+import json
+import random
+import time
+
+import httpx
+
+from bench.common import BENCH_PASSWORD, LETTER_TYPES, admin_email, format_table, percentile, warga_email
+
+SEARCH_TERMS = ["budi", "siti", "santoso", "wijaya", "ktp", "domisili", "skck", "usaha", "sekolah", "pindah"]
+
+
+@dataclass
+class Results:
+    latencies: dict[str, list[float]] = field(default_factory=dict)
+    errors: dict[str, int] = field(default_factory=dict)
+
+    def record(self, name: str, seconds: float, ok: bool) -> None:
+        self.latencies.setdefault(name, []).append(seconds)
+        if not ok:
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+
+@dataclass
+class Account:
+    token: str
+    submission_ids: list[int] = field(default_factory=list)
+
+
+class Scenario:
+    def __init__(self, client: httpx.AsyncClient, results: Results, args: argparse.Namespace):
+        self.client = client
+        self.results = results
+        self.args = args
+        self.wargas: list[Account] = []
+        self.admins: list[Account] = []
+        self.slugs: list[str] = []
+        self.steps = [
+            (self.login, 1),
+            (self.warga_list, 20),
+            (self.warga_detail, 20),
+            (self.admin_list, 10),
+            (self.admin_search, 10),
+            (self.admin_action, 4),
+            (self.public_list, 15),
+            (self.public_detail, 15),
+        ]
+
+    async def request(self, name: str, method: str, url: str, token: str | None = None, **kwargs) -> httpx.Response:
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=headers, **kwargs)
+        except httpx.TransportError:
+            # Dropped connections and timeouts count as errors instead of ending the run.
+            self.results.record(name, time.perf_counter() - started, False)
+            return httpx.Response(599, request=httpx.Request(method, url))
+        self.results.record(name, time.perf_counter() - started, response.status_code < 400)
+        return response
+
+    async def authenticate(self, email: str) -> httpx.Response:
+        return await self.request(
+            "POST /api/auth/login", "POST", "/api/auth/login", json={"email": email, "password": BENCH_PASSWORD}
+        )
+
+    async def account(self, email: str) -> Account:
+        response = (await self.authenticate(email)).raise_for_status()
+        return Account(token=response.json()["access_token"])
+
+    async def setup(self) -> None:
+        rng = random.Random(self.args.seed)
+        indexes = rng.sample(range(self.args.users), min(self.args.accounts, self.args.users))
+        self.wargas = [await self.account(warga_email(index)) for index in indexes]
+        self.admins = [await self.account(admin_email(index)) for index in range(self.args.admins)]
+        for account in self.wargas:
+            response = await self.request("GET /api/submissions", "GET", "/api/submissions", account.token)
+            account.submission_ids = [item["id"] for item in response.raise_for_status().json()]
+        response = await self.request("GET /api/announcements", "GET", "/api/announcements")
+        self.slugs = [item["slug"] for item in response.raise_for_status().json()]
+
+    async def login(self, rng: random.Random) -> None:
+        await self.authenticate(warga_email(rng.randrange(self.args.users)))
+
+    async def warga_list(self, rng: random.Random) -> None:
+        account = rng.choice(self.wargas)
+        params = {"type": rng.choice(LETTER_TYPES)} if rng.random() < 0.3 else {}
+        await self.request("GET /api/submissions", "GET", "/api/submissions", account.token, params=params)
+
+    async def warga_detail(self, rng: random.Random) -> None:
+        account = rng.choice([item for item in self.wargas if item.submission_ids] or self.wargas)
+        if not account.submission_ids:
+            return
+        submission_id = rng.choice(account.submission_ids)
+        await self.request("GET /api/submissions/{id}", "GET", f"/api/submissions/{submission_id}", account.token)
+
+    async def admin_list(self, rng: random.Random) -> None:
+        params = {"limit": 50}
+        if rng.random() < 0.5:
+            params["status"] = rng.choice(["SUBMITTED", "IN_REVIEW", "APPROVED"])
+        await self.request(
+            "GET /api/admin/submissions", "GET", "/api/admin/submissions", rng.choice(self.admins).token, params=params
+        )
+
+    async def admin_search(self, rng: random.Random) -> None:
+        params = {"limit": 50, "q": " ".join(rng.sample(SEARCH_TERMS, rng.randint(1, 2)))}
+        token = rng.choice(self.admins).token
+        await self.request("GET /api/admin/submissions?q", "GET", "/api/admin/submissions", token, params=params)
+
+    async def admin_action(self, rng: random.Random) -> None:
+        # SET_IN_REVIEW keeps the data set stable: it queues no letter renders and can be repeated.
+        account = rng.choice([item for item in self.wargas if item.submission_ids] or self.wargas)
+        if not account.submission_ids:
+            return
+        submission_id = rng.choice(account.submission_ids)
+        await self.request(
+            "POST /api/submissions/{id}/actions",
+            "POST",
+            f"/api/submissions/{submission_id}/actions",
+            rng.choice(self.admins).token,
+            json={"action": "SET_IN_REVIEW", "note": "bench"},
+        )
+
+    async def public_list(self, rng: random.Random) -> None:
+        await self.request("GET /api/announcements", "GET", "/api/announcements")
+
+    async def public_detail(self, rng: random.Random) -> None:
+        if self.slugs:
+            slug = rng.choice(self.slugs)
+            await self.request("GET /api/announcements/{slug}", "GET", f"/api/announcements/{slug}")
+
+    async def run_user(self, index: int, deadline: float) -> None:
+        rng = random.Random(self.args.seed + index)
+        steps, weights = zip(*self.steps)
+        while time.monotonic() < deadline:
+            await rng.choices(steps, weights)[0](rng)
+
+
+def report(results: Results, elapsed: float) -> dict:
+    rows = []
+    summary = {}
+    for name in sorted(results.latencies):
+        values = sorted(results.latencies[name])
+        stats = {
+            "count": len(values),
+            "errors": results.errors.get(name, 0),
+            "p50_ms": percentile(values, 0.50) * 1000,
+            "p95_ms": percentile(values, 0.95) * 1000,
+            "p99_ms": percentile(values, 0.99) * 1000,
+            "max_ms": values[-1] * 1000,
+        }
+        summary[name] = stats
+        rows.append([name, stats["count"], stats["errors"]] + [f"{stats[key]:.1f}" for key in list(stats)[2:]])
+    total = sum(len(values) for values in results.latencies.values())
+    print(format_table(["endpoint", "count", "errors", "p50 ms", "p95 ms", "p99 ms", "max ms"], rows))
+    print(f"\n{total} requests in {elapsed:.1f}s ({total / elapsed:.1f} req/s)")
+    return summary
+
+
+async def run(args: argparse.Namespace) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        scenario = Scenario(client, Results(), args)
+        await scenario.setup()
+        # Only the timed run is reported; setup logins would otherwise dominate the login row.
+        scenario.results = Results()
+        started = time.monotonic()
+        deadline = started + args.duration
+        await asyncio.gather(*(scenario.run_user(index, deadline) for index in range(args.concurrency)))
+        return report(scenario.results, time.monotonic() - started)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=8, help="virtual users issuing requests back to back")
+    parser.add_argument("--duration", type=float, default=60, help="seconds")
+    parser.add_argument("--users", type=int, default=5000, help="warga accounts created by generate_data")
+    parser.add_argument("--admins", type=int, default=3, help="admin accounts created by generate_data")
+    parser.add_argument("--accounts", type=int, default=50, help="warga accounts logged in for the scenario")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="also write the per-endpoint summary to this file")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    summary = asyncio.run(run(args))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump({"args": vars(args), "endpoints": summary}, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Micro-benchmarks for hot helpers that run without a database.
+
+From backend/:
+
+    python -m bench.micro --repeat 7
+"""
+import argparse
+from datetime import datetime, timedelta
+import statistics
+import timeit
+from typing import Callable, NamedTuple
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+
+from app import (
+    AdminSubmissionListItem,
+    Announcement,
+    AnnouncementListItem,
+    AnnouncementStatusEnum,
+    SubmissionStatusEnum,
+    build_admin_submission_page,
+    serialize_announcement,
+    serialize_announcement_list_item,
+    slugify,
+)
+from bench.common import LETTER_TYPES, format_table
+
+PAGE_SIZE = 50
+
+
+def sample_announcements(count: int) -> list[Announcement]:
+    now = datetime.utcnow()
+    return [
+        Announcement(
+            id=index,
+            slug=f"kerja-bakti-minggu-ini-{index}",
+            title=f"Kerja Bakti Minggu Ini #{index}",
+            excerpt="Diberitahukan kepada seluruh warga mengenai kerja bakti di lingkungan RW.",
+            category="Kegiatan",
+            content="# Kerja Bakti\n\n" + "Mohon kehadiran bapak/ibu sekalian. " * 40,
+            status=AnnouncementStatusEnum.PUBLISHED,
+            cover_stored_name=f"{index:032x}.jpg" if index % 2 else None,
+            cover_focus="center",
+            published_at=now,
+            created_at=now,
+            updated_at=now,
+        )
+        for index in range(count)
+    ]
+
+
+class SubmissionRow(NamedTuple):
+    # Stands in for the column rows admin_submissions_query returns.
+    id: int
+    user_id: int
+    owner_email: str
+    owner_full_name: str
+    owner_phone_number: str
+    owner_nik: str
+    owner_kk_number: str
+    type: str
+    status: SubmissionStatusEnum
+    created_at: datetime
+    updated_at: datetime
+
+
+def sample_submission_rows(count: int) -> list[SubmissionRow]:
+    now = datetime.utcnow()
+    return [
+        SubmissionRow(
+            id=index,
+            user_id=index,
+            owner_email=f"warga{index}@example.com",
+            owner_full_name="Budi Santoso",
+            owner_phone_number="081234567890",
+            owner_nik="3201010101010001",
+            owner_kk_number="3201010101010002",
+            type=LETTER_TYPES[index % len(LETTER_TYPES)],
+            status=SubmissionStatusEnum.SUBMITTED,
+            created_at=now - timedelta(minutes=index),
+            updated_at=now,
+        )
+        for index in range(count)
+    ]
+
+
+def stdlib_list_body(adapter: TypeAdapter, items: list[dict]) -> bytes:
+    # What FastAPI does with a response_model: validate every row, then encode with the stdlib json module.
+    return JSONResponse(jsonable_encoder(adapter.validate_python(items))).body
+
+
+def benchmarks() -> list[tuple[str, Callable[[], object]]]:
+    announcements = sample_announcements(PAGE_SIZE)
+    announcement = announcements[1]
+    # One extra row so the page builder also encodes the next-page cursor.
+    submission_rows = sample_submission_rows(PAGE_SIZE + 1)
+    announcement_items = [serialize_announcement_list_item(item, "Pengurus RW 1") for item in announcements]
+    submission_items = [row._asdict() for row in submission_rows[:PAGE_SIZE]]
+    announcement_adapter = TypeAdapter(list[AnnouncementListItem])
+    submission_adapter = TypeAdapter(list[AdminSubmissionListItem])
+    return [
+        ("slugify", lambda: slugify("Pengumuman Kerja Bakti & Posyandu Balita — RW 01 (Agustus 2026)")),
+        ("serialize_announcement", lambda: serialize_announcement(announcement, "Pengurus RW 1")),
+        ("serialize_announcement_list_item", lambda: serialize_announcement_list_item(announcement, "Pengurus RW 1")),
+        (
+            f"announcement list ({PAGE_SIZE} items, stdlib JSON)",
+            lambda: stdlib_list_body(announcement_adapter, announcement_items),
+        ),
+        (f"announcement list ({PAGE_SIZE} items, orjson)", lambda: ORJSONResponse(announcement_items).body),
+        (
+            f"build_admin_submission_page ({PAGE_SIZE} rows)",
+            lambda: build_admin_submission_page(submission_rows, PAGE_SIZE, Response()),
+        ),
+        (
+            f"admin submission page ({PAGE_SIZE} rows, stdlib JSON)",
+            lambda: stdlib_list_body(submission_adapter, submission_items),
+        ),
+        (f"admin submission page ({PAGE_SIZE} rows, orjson)", lambda: ORJSONResponse(submission_items).body),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="timing rounds per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per round (sets the loop count)")
+    args = parser.parse_args()
+
+    rows = []
+    for name, fn in benchmarks():
+        timer = timeit.Timer(fn)
+        loops, elapsed = timer.autorange()
+        loops = max(1, int(loops * args.min_time / max(elapsed, 1e-9)))
+        per_call = [total / loops for total in timer.repeat(repeat=args.repeat, number=loops)]
+        best, median = min(per_call), statistics.median(per_call)
+        rows.append([name, loops, f"{best * 1e6:.1f}", f"{median * 1e6:.1f}", f"{1 / median:,.0f}"])
+    print(format_table(["benchmark", "loops", "best us", "median us", "ops/s"], rows))
+
+
+if __name__ == "__main__":
+    main()
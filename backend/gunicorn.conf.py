@@ -0,0 +1,53 @@
+import multiprocessing
+import os
+
+# Production serving: gunicorn supervises uvicorn workers. Read before the app is imported, so the
+# worker count exported here is what app.db_pool_sizes() divides the Postgres connections by.
+bind = os.getenv("BIND", "0.0.0.0:8000")
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.getenv("WEB_CONCURRENCY") or multiprocessing.cpu_count())
+os.environ["WEB_CONCURRENCY"] = str(workers)
+# Each worker writes metric snapshots here and /api/metrics merges them, whichever worker is scraped.
+metrics_dir = os.environ.setdefault("METRICS_DIR", "/tmp/siwarga-metrics")
+
+# Import the app once in the master so workers fork with the code already loaded (faster boot, shared pages).
+preload_app = True
+
+# Recycle workers after a jittered number of requests so they do not all restart at once.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "200"))
+# Seconds a stopping worker gets to finish in-flight requests (long SSE streams are cut and reconnect).
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+keepalive = 5
+
+accesslog = "-"
+
+
+def post_fork(server, worker):
+    # With preload_app the engines were built in the master. Forget any pooled connections inherited
+    # from it, without closing the master's sockets, so each worker opens its own.
+    import app
+
+    app.engine.dispose(close=False)
+    if app.async_engine is not None:
+        app.async_engine.sync_engine.dispose(close=False)
+
+
+def on_starting(server):
+    import app
+    import metrics
+
+    # Calibrate once here, before any worker exists: workers calibrating side by side at boot compete
+    # for the CPU and can settle on different costs. Forked workers inherit the result.
+    server.log.info("Password hash cost: %s", app.calibrate_password_hash_cost())
+    # Snapshots left by a previous run would otherwise be merged into this one.
+    if metrics_dir:
+        metrics.clear_directory(metrics_dir)
+
+
+def child_exit(server, worker):
+    import metrics
+
+    if metrics_dir:
+        metrics.mark_process_dead(metrics_dir, worker.pid)
@@ -0,0 +1,156 @@
+from functools import lru_cache
+import os
+from string import Template
+import tempfile
+from typing import NamedTuple
+from xml.sax.saxutils import escape
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import cm
+from reportlab.platypus import HRFlowable, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+# Rendered in the letter pool workers, so keep this module free of app imports.
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "letter_templates")
+DEFAULT_TEMPLATE = "umum"
+TEMPLATE_BY_TYPE = {
+    "Surat Pengantar KTP": "ktp",
+    "Surat Pengantar KK": "kk",
+    "Surat Pengantar Domisili": "domisili",
+    "Surat Pengantar SKCK": "skck",
+    "Surat Pengantar Nikah": "nikah",
+    "Surat Pengantar Usaha (UMKM)": "usaha",
+    "Surat Pengantar Tidak Mampu": "tidak_mampu",
+}
+IDENTITY_ROWS = [
+    ("Nama", "full_name"),
+    ("NIK", "nik"),
+    ("No. KK", "kk_number"),
+    ("No. HP", "phone_number"),
+    ("Email", "email"),
+]
+MONTHS_ID = [
+    "Januari",
+    "Februari",
+    "Maret",
+    "April",
+    "Mei",
+    "Juni",
+    "Juli",
+    "Agustus",
+    "September",
+    "Oktober",
+    "November",
+    "Desember",
+]
+
+
+def current_umask() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# mkstemp creates files as 0600, but with FILE_OFFLOAD=nginx they are read by nginx as another user.
+SERVED_FILE_MODE = 0o644 & ~current_umask()
+
+
+class LetterTemplate(NamedTuple):
+    title: Template
+    intro: Template
+    body: tuple[Template, ...]
+
+
+class LetterFields(dict):
+    def __missing__(self, key: str) -> str:
+        return "-"
+
+
+def template_name(submission_type: str) -> str:
+    return TEMPLATE_BY_TYPE.get(submission_type, DEFAULT_TEMPLATE)
+
+
+@lru_cache(maxsize=None)
+def load_template(name: str) -> LetterTemplate:
+    with open(os.path.join(TEMPLATES_DIR, f"{name}.txt"), encoding="utf-8") as handle:
+        blocks = [" ".join(block.split()) for block in handle.read().split("\n\n") if block.strip()]
+    if len(blocks) < 2:
+        raise ValueError(f"Letter template {name} needs a title and an intro paragraph")
+    return LetterTemplate(
+        title=Template(blocks[0]),
+        intro=Template(blocks[1]),
+        body=tuple(Template(block) for block in blocks[2:]),
+    )
+
+
+@lru_cache(maxsize=1)
+def letter_styles() -> dict[str, ParagraphStyle]:
+    base = getSampleStyleSheet()
+    body = ParagraphStyle("LetterBody", parent=base["Normal"], fontSize=11, leading=16, spaceAfter=8)
+    return {
+        "org": ParagraphStyle("LetterOrg", parent=base["Title"], fontSize=14, leading=18, spaceAfter=0),
+        "address": ParagraphStyle("LetterAddress", parent=body, alignment=1, fontSize=9, leading=12),
+        "title": ParagraphStyle("LetterTitle", parent=base["Title"], fontSize=12, leading=16, spaceAfter=0),
+        "number": ParagraphStyle("LetterNumber", parent=body, alignment=1, spaceAfter=16),
+        "body": body,
+        "signature": ParagraphStyle("LetterSignature", parent=body, leftIndent=9.5 * cm),
+    }
+
+
+def format_date_id(year: int, month: int, day: int) -> str:
+    return f"{day} {MONTHS_ID[month - 1]} {year}"
+
+
+def paragraph(template: Template, fields: LetterFields, style: ParagraphStyle) -> Paragraph:
+    return Paragraph(escape(template.substitute(fields)), style)
+
+
+def build_story(template: LetterTemplate, fields: LetterFields) -> list:
+    styles = letter_styles()
+    identity = Table(
+        [[label, ":", fields[key]] for label, key in IDENTITY_ROWS],
+        colWidths=[3.5 * cm, 0.5 * cm, 11 * cm],
+        hAlign="LEFT",
+    )
+    identity.setStyle(TableStyle([("FONTSIZE", (0, 0), (-1, -1), 11), ("LEFTPADDING", (0, 0), (0, -1), 1 * cm)]))
+    return [
+        Paragraph(escape(fields["org_name"].upper()), styles["org"]),
+        Paragraph(escape(fields["org_address"]), styles["address"]),
+        HRFlowable(width="100%", thickness=1.5, spaceBefore=4, spaceAfter=14),
+        Paragraph(f"<u>{escape(template.title.substitute(fields))}</u>", styles["title"]),
+        Paragraph(escape(f"Nomor: {fields['letter_number']}"), styles["number"]),
+        paragraph(template.intro, fields, styles["body"]),
+        identity,
+        Spacer(1, 8),
+        *[paragraph(block, fields, styles["body"]) for block in template.body],
+        Spacer(1, 24),
+        Paragraph(escape(", ".join(filter(None, [fields["org_city"], fields["issued_date"]]))), styles["signature"]),
+        Paragraph(escape(f"Ketua {fields['org_name']}"), styles["signature"]),
+        Spacer(1, 48),
+        Paragraph(f"<u>{escape(fields['signer_name'])}</u>", styles["signature"]),
+    ]
+
+
+def render_letter(output_path: str, submission_type: str, fields: dict[str, str]) -> str:
+    template = load_template(template_name(submission_type))
+    output_dir = os.path.dirname(output_path)
+    fd, temp_path = tempfile.mkstemp(dir=output_dir, suffix=".part")
+    os.fchmod(fd, SERVED_FILE_MODE)
+    os.close(fd)
+    try:
+        document = SimpleDocTemplate(
+            temp_path,
+            pagesize=A4,
+            leftMargin=2.5 * cm,
+            rightMargin=2.5 * cm,
+            topMargin=2 * cm,
+            bottomMargin=2 * cm,
+            title=template.title.substitute(LetterFields(fields)),
+        )
+        document.build(build_story(template, LetterFields(fields)))
+        os.replace(temp_path, output_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return output_path
@@ -0,0 +1,258 @@
+from bisect import bisect_left
+import glob
+import json
+import math
+import os
+import threading
+from typing import Any, Callable, Iterable
+
+# Minimal Prometheus text-format registry: metrics live in this process and are rendered on scrape.
+# With several worker processes (gunicorn), each one writes snapshots to a shared directory and a
+# scrape merges them, in the spirit of prometheus_client's multiprocess mode.
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+ARCHIVE_FILE = "archive.json"
+
+Sample = tuple[str, dict[str, str], float]
+
+
+def format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{escape_label_value(str(value))}"' for key, value in labels.items()) + "}"
+
+
+class Metric:
+    kind = "untyped"
+    # How samples from several processes combine: "sum" or "max".
+    aggregate = "sum"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def key(self, labels: tuple[str, ...]) -> tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        return tuple(str(label) for label in labels)
+
+    def samples(self) -> list[Sample]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        # The _total suffix is part of the metric name, so HELP/TYPE and the samples agree.
+        super().__init__(f"{name}_total", documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        key = self.key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> list[Sample]:
+        with self._lock:
+            items = list(self._values.items())
+        return [(self.name, dict(zip(self.labelnames, key)), value) for key, value in items]
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), aggregate: str = "sum"):
+        super().__init__(name, documentation, labelnames)
+        if aggregate not in ("sum", "max"):
+            raise ValueError(f"Unsupported aggregate for {name}: {aggregate}")
+        self.aggregate = aggregate
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        key = self.key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float) -> None:
+        key = self.key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def samples(self) -> list[Sample]:
+        with self._lock:
+            items = list(self._values.items())
+        return [(self.name, dict(zip(self.labelnames, key)), value) for key, value in items]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Non-cumulative counts per label set; the last slot is the +Inf bucket.
+        self._counts: dict[tuple[str, ...], list[int]] = {}
+        self._sums: dict[tuple[str, ...], float] = {}
+
+    def observe(self, *labels: str, value: float) -> None:
+        key = self.key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            counts[index] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def samples(self) -> list[Sample]:
+        with self._lock:
+            items = [(key, list(counts), self._sums[key]) for key, counts in self._counts.items()]
+        samples = []
+        for key, counts, total in items:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", {**labels, "le": format_value(bound)}, cumulative))
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+def render_families(families: Iterable[dict[str, Any]]) -> str:
+    lines = []
+    for family in families:
+        lines.append(f"# HELP {family['name']} {family['documentation']}")
+        lines.append(f"# TYPE {family['name']} {family['kind']}")
+        for name, labels, value in family["samples"]:
+            lines.append(f"{name}{format_labels(labels)} {format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def merge_families(snapshots: Iterable[list[dict[str, Any]]]) -> list[dict[str, Any]]:
+    merged: dict[str, dict[str, Any]] = {}
+    for families in snapshots:
+        for family in families:
+            target = merged.setdefault(family["name"], {**family, "samples": {}})
+            for name, labels, value in family["samples"]:
+                key = (name, tuple(labels.items()))
+                current = target["samples"].get(key)
+                if current is None:
+                    target["samples"][key] = value
+                elif family["aggregate"] == "max":
+                    target["samples"][key] = max(current, value)
+                else:
+                    target["samples"][key] = current + value
+    return [
+        {**family, "samples": [(name, dict(labels), value) for (name, labels), value in family["samples"].items()]}
+        for family in merged.values()
+    ]
+
+
+def read_snapshot(path: str) -> list[dict[str, Any]]:
+    try:
+        with open(path, encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        # Removed by mark_process_dead between listing and reading.
+        return []
+
+
+def write_snapshot(path: str, families: list[dict[str, Any]]) -> None:
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as handle:
+        json.dump(families, handle)
+    os.replace(temp_path, path)
+
+
+def clear_directory(directory: str) -> None:
+    os.makedirs(directory, exist_ok=True)
+    for path in glob.glob(os.path.join(directory, "*.json")):
+        os.remove(path)
+
+
+def mark_process_dead(directory: str, pid: int) -> None:
+    # Called in the gunicorn master when a worker exits. Its counters and histograms are folded into
+    # the archive so totals never go backwards across worker recycling; its gauges no longer apply.
+    path = os.path.join(directory, f"{pid}.json")
+    families = [family for family in read_snapshot(path) if family["kind"] != "gauge"]
+    if families:
+        archive_path = os.path.join(directory, ARCHIVE_FILE)
+        write_snapshot(archive_path, merge_families([read_snapshot(archive_path), families]))
+    if os.path.exists(path):
+        os.remove(path)
+
+
+class Registry:
+    def __init__(self, directory: str = ""):
+        self.metrics: list[Metric] = []
+        self.collectors: list[Callable[[], None]] = []
+        self.directory = directory
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Iterable[str] = (), aggregate: str = "sum"
+    ) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, aggregate))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = ()
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def collector(self, fn: Callable[[], None]) -> Callable[[], None]:
+        # Collectors refresh gauges that are cheaper to read on scrape than to track on every change.
+        self.collectors.append(fn)
+        return fn
+
+    def collect(self) -> list[dict[str, Any]]:
+        for collect in self.collectors:
+            collect()
+        return [
+            {
+                "name": metric.name,
+                "documentation": metric.documentation,
+                "kind": metric.kind,
+                "aggregate": metric.aggregate,
+                "samples": metric.samples(),
+            }
+            for metric in self.metrics
+        ]
+
+    def flush(self) -> None:
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            write_snapshot(os.path.join(self.directory, f"{os.getpid()}.json"), self.collect())
+
+    def render(self) -> str:
+        if not self.directory:
+            return render_families(self.collect())
+        # Fresh numbers for this process; the other workers' snapshots are at most one flush interval old.
+        self.flush()
+        paths = sorted(glob.glob(os.path.join(self.directory, "*.json")))
+        return render_families(merge_families(read_snapshot(path) for path in paths))
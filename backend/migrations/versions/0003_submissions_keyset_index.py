@@ -0,0 +1,20 @@
+"""add keyset pagination index on submissions
+
+Revision ID: 0003_submissions_keyset_index
+Revises: 0002_announcements
+Create Date: 2026-10-18 09:00:00.000000
+"""
+from alembic import op
+
+revision = "0003_submissions_keyset_index"
+down_revision = "0002_announcements"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_submissions_created_at_id", "submissions", ["created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_submissions_created_at_id", table_name="submissions")
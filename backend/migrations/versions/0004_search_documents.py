@@ -0,0 +1,43 @@
+"""add search documents for submissions and announcements
+
+Revision ID: 0004_search_documents
+Revises: 0003_submissions_keyset_index
+Create Date: 2026-10-18 10:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004_search_documents"
+down_revision = "0003_submissions_keyset_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("submissions", sa.Column("search_text", sa.Text(), nullable=False, server_default=""))
+    op.add_column("announcements", sa.Column("search_text", sa.Text(), nullable=False, server_default=""))
+
+    # Same values as flatten_search_values in app.py: every string and number at any depth, nulls and booleans skipped.
+    op.execute(
+        "UPDATE submissions s SET search_text = lower(concat_ws(' ', u.email, u.full_name, u.nik, s.type, "
+        "(SELECT string_agg(v #>> '{}', ' ') FROM jsonb_path_query(s.payload::jsonb, 'strict $.**') AS v "
+        "WHERE jsonb_typeof(v) IN ('string', 'number')))) "
+        "FROM users u WHERE u.id = s.user_id"
+    )
+    op.execute("UPDATE announcements SET search_text = lower(concat_ws(' ', title, excerpt, category, slug))")
+
+    op.execute(
+        "CREATE INDEX ix_submissions_search ON submissions "
+        "USING gin (to_tsvector('simple'::regconfig, search_text))"
+    )
+    op.execute(
+        "CREATE INDEX ix_announcements_search ON announcements "
+        "USING gin (to_tsvector('simple'::regconfig, search_text))"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_announcements_search", table_name="announcements")
+    op.drop_index("ix_submissions_search", table_name="submissions")
+    op.drop_column("announcements", "search_text")
+    op.drop_column("submissions", "search_text")
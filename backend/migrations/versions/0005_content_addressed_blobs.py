@@ -0,0 +1,38 @@
+"""add content-addressed blob store for submission files
+
+Revision ID: 0005_content_addressed_blobs
+Revises: 0004_search_documents
+Create Date: 2026-10-18 11:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005_content_addressed_blobs"
+down_revision = "0004_search_documents"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "blobs",
+        sa.Column("sha256", sa.String(length=64), primary_key=True),
+        sa.Column("stored_name", sa.String(length=255), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+
+    op.add_column(
+        "submission_files",
+        sa.Column("blob_sha256", sa.String(length=64), sa.ForeignKey("blobs.sha256"), nullable=True),
+    )
+    op.create_index("ix_submission_files_blob_sha256", "submission_files", ["blob_sha256"])
+    op.drop_constraint("submission_files_stored_name_key", "submission_files", type_="unique")
+
+
+def downgrade() -> None:
+    op.create_unique_constraint("submission_files_stored_name_key", "submission_files", ["stored_name"])
+    op.drop_index("ix_submission_files_blob_sha256", table_name="submission_files")
+    op.drop_column("submission_files", "blob_sha256")
+    op.drop_table("blobs")
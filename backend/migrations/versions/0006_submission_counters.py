@@ -0,0 +1,43 @@
+"""add submission counters for admin stats
+
+Revision ID: 0006_submission_counters
+Revises: 0005_content_addressed_blobs
+Create Date: 2026-10-18 12:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0006_submission_counters"
+down_revision = "0005_content_addressed_blobs"
+branch_labels = None
+depends_on = None
+
+status_enum = postgresql.ENUM(
+    "SUBMITTED",
+    "IN_REVIEW",
+    "NEED_REVISION",
+    "APPROVED",
+    "REJECTED",
+    name="submissionstatusenum",
+    create_type=False,
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "submission_counters",
+        sa.Column("type", sa.String(length=100), primary_key=True),
+        sa.Column("status", status_enum, primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+    )
+    op.execute(
+        """
+        INSERT INTO submission_counters (type, status, count)
+        SELECT type, status, count(*) FROM submissions GROUP BY type, status
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("submission_counters")
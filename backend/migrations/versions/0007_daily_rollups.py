@@ -0,0 +1,33 @@
+"""add daily rollups for reporting
+
+Revision ID: 0007_daily_rollups
+Revises: 0006_submission_counters
+Create Date: 2026-10-18 13:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007_daily_rollups"
+down_revision = "0006_submission_counters"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "daily_rollups",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("metric", sa.String(length=40), primary_key=True),
+        sa.Column("dimension", sa.String(length=120), primary_key=True),
+        sa.Column("value", sa.BigInteger(), nullable=False),
+    )
+    op.create_table(
+        "rollup_watermarks",
+        sa.Column("name", sa.String(length=40), primary_key=True),
+        sa.Column("rolled_through", sa.Date(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("rollup_watermarks")
+    op.drop_table("daily_rollups")
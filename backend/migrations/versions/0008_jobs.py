@@ -0,0 +1,60 @@
+"""add postgres-backed job queue
+
+Revision ID: 0008_jobs
+Revises: 0007_daily_rollups
+Create Date: 2026-10-18 14:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0008_jobs"
+down_revision = "0007_daily_rollups"
+branch_labels = None
+depends_on = None
+
+
+job_status_enum = postgresql.ENUM(
+    "QUEUED",
+    "RUNNING",
+    "DONE",
+    "FAILED",
+    name="jobstatusenum",
+    create_type=False,
+)
+
+
+def upgrade() -> None:
+    op.execute(
+        "DO $$ BEGIN "
+        "CREATE TYPE jobstatusenum AS ENUM ('QUEUED', 'RUNNING', 'DONE', 'FAILED'); "
+        "EXCEPTION WHEN duplicate_object THEN NULL; "
+        "END $$;"
+    )
+
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("kind", sa.String(length=60), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("status", job_status_enum, nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column("run_at", sa.DateTime(), nullable=False),
+        sa.Column("locked_by", sa.String(length=120), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index(
+        "ix_jobs_claim", "jobs", ["kind", "run_at"], postgresql_where=sa.text("status = 'QUEUED'")
+    )
+    op.create_index("ix_jobs_status_finished_at", "jobs", ["status", "finished_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_status_finished_at", table_name="jobs")
+    op.drop_index("ix_jobs_claim", table_name="jobs")
+    op.drop_table("jobs")
+    op.execute("DROP TYPE IF EXISTS jobstatusenum;")
@@ -0,0 +1,96 @@
+"""partition approval_logs by month
+
+Revision ID: 0009_partition_approval_logs
+Revises: 0008_jobs
+Create Date: 2026-10-18 15:00:00.000000
+"""
+from datetime import date, datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009_partition_approval_logs"
+down_revision = "0008_jobs"
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # Keep the id sequence alive (and its current value) when the old table is dropped.
+    op.execute("ALTER SEQUENCE approval_logs_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE approval_logs RENAME TO approval_logs_legacy")
+    op.execute("ALTER INDEX ix_approval_logs_submission_id RENAME TO ix_approval_logs_legacy_submission_id")
+    op.execute("ALTER TABLE approval_logs_legacy RENAME CONSTRAINT approval_logs_pkey TO approval_logs_legacy_pkey")
+
+    op.execute(
+        """
+        CREATE TABLE approval_logs (
+            id integer NOT NULL DEFAULT nextval('approval_logs_id_seq'),
+            submission_id integer NOT NULL REFERENCES submissions (id),
+            actor_user_id integer NOT NULL REFERENCES users (id),
+            action submissionactionenum NOT NULL,
+            note text,
+            created_at timestamp without time zone NOT NULL,
+            CONSTRAINT approval_logs_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute("ALTER SEQUENCE approval_logs_id_seq OWNED BY approval_logs.id")
+
+    first = bind.execute(sa.text("SELECT min(created_at) FROM approval_logs_legacy")).scalar()
+    current = date.today().replace(day=1)
+    month = (first.date() if first else current).replace(day=1)
+    while month <= add_months(current, MONTHS_AHEAD):
+        next_month = add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE approval_logs_p{month:%Y%m} PARTITION OF approval_logs "
+            f"FOR VALUES FROM ('{datetime(month.year, month.month, 1)}') "
+            f"TO ('{datetime(next_month.year, next_month.month, 1)}')"
+        )
+        month = next_month
+    op.execute("CREATE TABLE approval_logs_default PARTITION OF approval_logs DEFAULT")
+
+    op.execute(
+        "INSERT INTO approval_logs (id, submission_id, actor_user_id, action, note, created_at) "
+        "SELECT id, submission_id, actor_user_id, action, note, created_at FROM approval_logs_legacy"
+    )
+    op.execute("DROP TABLE approval_logs_legacy")
+    op.create_index(
+        "ix_approval_logs_submission_id_created_at", "approval_logs", ["submission_id", "created_at"]
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER SEQUENCE approval_logs_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE approval_logs RENAME TO approval_logs_partitioned")
+    op.execute("ALTER INDEX ix_approval_logs_submission_id_created_at RENAME TO ix_approval_logs_partitioned_lookup")
+    op.execute(
+        "ALTER TABLE approval_logs_partitioned RENAME CONSTRAINT approval_logs_pkey TO approval_logs_partitioned_pkey"
+    )
+    op.execute(
+        """
+        CREATE TABLE approval_logs (
+            id integer NOT NULL DEFAULT nextval('approval_logs_id_seq') PRIMARY KEY,
+            submission_id integer NOT NULL REFERENCES submissions (id),
+            actor_user_id integer NOT NULL REFERENCES users (id),
+            action submissionactionenum NOT NULL,
+            note text,
+            created_at timestamp without time zone NOT NULL
+        )
+        """
+    )
+    op.execute("ALTER SEQUENCE approval_logs_id_seq OWNED BY approval_logs.id")
+    op.execute(
+        "INSERT INTO approval_logs (id, submission_id, actor_user_id, action, note, created_at) "
+        "SELECT id, submission_id, actor_user_id, action, note, created_at FROM approval_logs_partitioned"
+    )
+    op.execute("DROP TABLE approval_logs_partitioned CASCADE")
+    op.create_index("ix_approval_logs_submission_id", "approval_logs", ["submission_id"])
@@ -0,0 +1,44 @@
+from functools import lru_cache
+import time
+
+from passlib.context import CryptContext
+
+# Imported by the hashing pool workers, so keep this module free of app imports.
+COST_RANGES = {"bcrypt": range(10, 15), "argon2": range(1, 11)}
+DEFAULT_COSTS = {"bcrypt": 12, "argon2": 2}
+ARGON2_MEMORY_KIB = 19456
+
+
+@lru_cache(maxsize=8)
+def build_context(scheme: str, cost: int) -> CryptContext:
+    if scheme == "argon2":
+        return CryptContext(
+            schemes=["argon2", "bcrypt"],
+            deprecated=["bcrypt"],
+            argon2__memory_cost=ARGON2_MEMORY_KIB,
+            argon2__time_cost=cost,
+            argon2__parallelism=1,
+        )
+    if scheme == "bcrypt":
+        return CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=cost, bcrypt__min_rounds=cost)
+    raise ValueError(f"Unsupported password hash scheme: {scheme}")
+
+
+def hash_password(password: str, scheme: str, cost: int) -> str:
+    return build_context(scheme, cost).hash(password)
+
+
+def verify_and_update(password: str, hashed_password: str, scheme: str, cost: int) -> tuple[bool, str | None]:
+    return build_context(scheme, cost).verify_and_update(password, hashed_password)
+
+
+def calibrate_cost(scheme: str, target_ms: int) -> int:
+    costs = COST_RANGES[scheme]
+    chosen = costs[0]
+    for cost in costs:
+        started = time.perf_counter()
+        hash_password("calibration", scheme, cost)
+        if (time.perf_counter() - started) * 1000 > target_ms:
+            break
+        chosen = cost
+    return chosen
@@ -0,0 +1,100 @@
+"""Tests run against a disposable Postgres database named by TEST_DATABASE_URL.
+
+The public schema is dropped and rebuilt from the Alembic migrations once per session,
+so never point TEST_DATABASE_URL at a database whose data you want to keep.
+"""
+from contextlib import contextmanager
+import os
+from uuid import uuid4
+
+from alembic import command
+from alembic.config import Config
+from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy import event, text
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "")
+if TEST_DATABASE_URL:
+    # app reads DATABASE_URL at import time, so set it before any test module imports app.
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+
+
+@pytest.fixture(scope="session")
+def database():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    import app
+
+    with app.engine.begin() as conn:
+        conn.execute(text("DROP SCHEMA public CASCADE"))
+        conn.execute(text("CREATE SCHEMA public"))
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    command.upgrade(config, "head")
+    yield app
+    app.engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def clean_database(database):
+    # Every test starts from empty tables and caches; the schema itself is built once per session.
+    tables = ", ".join(table.name for table in database.Base.metadata.sorted_tables)
+    with database.engine.begin() as conn:
+        conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+    database.principal_cache.clear()
+    database.invalidate_public_cache()
+
+
+@pytest.fixture
+def create_user(database):
+    def create(db, role=None, **fields):
+        profile = {
+            "full_name": "Budi Santoso",
+            "phone_number": "081234567890",
+            "nik": "3201010101010001",
+            "kk_number": "3201010101010002",
+        }
+        user = database.User(
+            email=f"{uuid4().hex[:12]}@example.com",
+            hashed_password="unused",
+            role=role or database.RoleEnum.WARGA,
+            **{**profile, **fields},
+        )
+        db.add(user)
+        db.flush()
+        return user
+
+    return create
+
+
+@pytest.fixture
+def auth_headers(database):
+    def headers(user):
+        return {"Authorization": f"Bearer {database.create_access_token(user.id)}"}
+
+    return headers
+
+
+@pytest.fixture
+def client(database):
+    # No lifespan: the event listener and job threads started there would also run statements on the engine.
+    return TestClient(database.app)
+
+
+@pytest.fixture
+def count_queries(database):
+    @contextmanager
+    def counter():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(database.engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(database.engine, "before_cursor_execute", record)
+
+    return counter
@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def admin_list(database, create_user, auth_headers):
+    # Nine submissions over five timestamps, so pages have to break ties on id.
+    base = datetime(2026, 3, 1, 8, 0, 0)
+    with database.SessionLocal() as db:
+        warga = create_user(db)
+        admin = create_user(db, app.RoleEnum.ADMIN_RW)
+        for index in range(9):
+            db.add(
+                app.Submission(
+                    user_id=warga.id,
+                    type="Surat Pengantar KTP",
+                    payload={},
+                    status=app.SubmissionStatusEnum.APPROVED if index % 3 == 0 else app.SubmissionStatusEnum.SUBMITTED,
+                    created_at=base + timedelta(minutes=index // 2),
+                    updated_at=base,
+                )
+            )
+        db.commit()
+        rows = db.execute(
+            app.select(app.Submission.id, app.Submission.status).order_by(
+                app.Submission.created_at.desc(), app.Submission.id.desc()
+            )
+        ).all()
+        expected = [row.id for row in rows]
+        approved = [row.id for row in rows if row.status == app.SubmissionStatusEnum.APPROVED]
+        return {"headers": auth_headers(admin), "expected": expected, "approved": approved}
+
+
+def fetch_all_pages(client, headers, **params):
+    pages = []
+    cursor = params.pop("cursor", None)
+    while True:
+        page_params = {**params, "cursor": cursor} if cursor else params
+        response = client.get("/api/admin/submissions", params=page_params, headers=headers)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        pages.append([item["id"] for item in body["items"]])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_pages_follow_created_at_then_id(client, admin_list):
+    pages = fetch_all_pages(client, admin_list["headers"], limit=2)
+
+    assert [len(page) for page in pages] == [2, 2, 2, 2, 1]
+    assert [item for page in pages for item in page] == admin_list["expected"]
+
+
+def test_default_page_size_applies_without_parameters(client, admin_list):
+    body = client.get("/api/admin/submissions", headers=admin_list["headers"]).json()
+
+    assert [item["id"] for item in body["items"]] == admin_list["expected"]
+    assert body["next_cursor"] is None
+
+
+def test_cursor_keeps_filters(client, admin_list):
+    pages = fetch_all_pages(client, admin_list["headers"], limit=1, status="APPROVED")
+
+    assert [item for page in pages for item in page] == admin_list["approved"]
+
+
+def test_rows_added_after_the_first_page_do_not_shift_later_pages(client, database, admin_list):
+    first = client.get("/api/admin/submissions", params={"limit": 4}, headers=admin_list["headers"]).json()
+    with database.SessionLocal() as db:
+        owner_id = db.scalar(app.select(app.Submission.user_id).limit(1))
+        db.add(
+            app.Submission(
+                user_id=owner_id, type="Surat Pengantar KK", payload={}, status=app.SubmissionStatusEnum.SUBMITTED
+            )
+        )
+        db.commit()
+
+    rest = fetch_all_pages(client, admin_list["headers"], limit=4, cursor=first["next_cursor"])
+
+    assert [item["id"] for item in first["items"]] + [item for page in rest for item in page] == admin_list["expected"]
+
+
+@pytest.mark.parametrize(
+    "params, status_code",
+    [({"cursor": "not-a-cursor"}, 400), ({"limit": 0}, 422), ({"limit": app.ADMIN_PAGE_SIZE_MAX + 1}, 422)],
+)
+def test_rejects_bad_paging_parameters(client, admin_list, params, status_code):
+    response = client.get("/api/admin/submissions", params=params, headers=admin_list["headers"])
+
+    assert response.status_code == status_code
@@ -0,0 +1,83 @@
+import pytest
+
+import app
+
+
+@pytest.fixture
+def review_queue(database, create_user, auth_headers):
+    with database.SessionLocal() as db:
+        warga = create_user(db)
+        admin = create_user(db, app.RoleEnum.ADMIN_RW)
+        statuses = [app.SubmissionStatusEnum.SUBMITTED, app.SubmissionStatusEnum.IN_REVIEW, app.SubmissionStatusEnum.APPROVED]
+        submissions = [
+            app.Submission(user_id=warga.id, type="Surat Pengantar KTP", payload={}, status=status) for status in statuses
+        ]
+        db.add_all(submissions)
+        database.adjust_submission_counters(db, {("Surat Pengantar KTP", status): 1 for status in statuses})
+        db.commit()
+        return {"ids": [submission.id for submission in submissions], "admin_id": admin.id, "headers": auth_headers(admin)}
+
+
+def test_partial_failure_reports_each_id_in_request_order(client, database, review_queue):
+    submitted, in_review, approved = review_queue["ids"]
+    missing = approved + 1000
+
+    response = client.post(
+        "/api/admin/submissions/actions:bulk",
+        json={"submission_ids": [in_review, missing, submitted, in_review, approved], "action": "APPROVE"},
+        headers=review_queue["headers"],
+    )
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["status"] == "APPROVED"
+    assert body["updated"] == 3
+    assert [(result["submission_id"], result["ok"]) for result in body["results"]] == [
+        (in_review, True),
+        (missing, False),
+        (submitted, True),
+        (approved, True),
+    ]
+    assert body["results"][1]["detail"] == "Submission not found"
+    assert [result["previous_status"] for result in body["results"]] == ["IN_REVIEW", None, "SUBMITTED", "APPROVED"]
+
+    with database.SessionLocal() as db:
+        logs = db.scalars(app.select(app.ApprovalLog).order_by(app.ApprovalLog.submission_id)).all()
+        assert [(log.submission_id, log.action, log.actor_user_id) for log in logs] == [
+            (submission_id, app.SubmissionActionEnum.APPROVE, review_queue["admin_id"])
+            for submission_id in review_queue["ids"]
+        ]
+        assert {log.id for log in logs} == {result["log_id"] for result in body["results"] if result["ok"]}
+        statuses = db.scalars(app.select(app.Submission.status).where(app.Submission.id.in_(review_queue["ids"])))
+        assert set(statuses) == {app.SubmissionStatusEnum.APPROVED}
+        jobs = db.scalars(app.select(app.Job).where(app.Job.kind == "letter.render")).all()
+        assert sorted(job.payload["submission_id"] for job in jobs) == review_queue["ids"]
+
+
+def test_counters_move_only_for_changed_rows(client, review_queue):
+    response = client.post(
+        "/api/admin/submissions/actions:bulk",
+        json={"submission_ids": review_queue["ids"], "action": "APPROVE"},
+        headers=review_queue["headers"],
+    )
+    assert response.status_code == 200, response.text
+
+    stats = client.get("/api/admin/submissions/stats", headers=review_queue["headers"]).json()
+    assert stats["total"] == 3
+    assert stats["by_status"]["APPROVED"] == 3
+    assert stats["by_status"]["SUBMITTED"] == 0
+    assert stats["by_status"]["IN_REVIEW"] == 0
+
+
+def test_all_missing_ids_change_nothing(client, database, review_queue):
+    response = client.post(
+        "/api/admin/submissions/actions:bulk",
+        json={"submission_ids": [max(review_queue["ids"]) + 1], "action": "REJECT"},
+        headers=review_queue["headers"],
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json()["updated"] == 0
+    with database.SessionLocal() as db:
+        assert db.scalar(app.select(app.func.count()).select_from(app.ApprovalLog)) == 0
+        assert db.scalar(app.select(app.func.count()).select_from(app.Job)) == 0
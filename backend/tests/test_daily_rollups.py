@@ -0,0 +1,117 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def owner_id(database, create_user):
+    with database.SessionLocal() as db:
+        user = create_user(db)
+        db.commit()
+        return user.id
+
+
+def add_submissions(database, owner_id, *created_at):
+    with database.SessionLocal() as db:
+        db.add_all(
+            [
+                app.Submission(
+                    user_id=owner_id,
+                    type="Surat Pengantar KTP",
+                    payload={},
+                    status=app.SubmissionStatusEnum.SUBMITTED,
+                    created_at=value,
+                )
+                for value in created_at
+            ]
+        )
+        db.commit()
+
+
+def day_at_noon(day):
+    return datetime(day.year, day.month, day.day, 12)
+
+
+def created_counts(database):
+    with database.SessionLocal() as db:
+        rows = db.execute(
+            app.select(app.DailyRollup.day, app.DailyRollup.value).where(
+                app.DailyRollup.metric == "submissions_created"
+            )
+        ).all()
+        return {row.day: row.value for row in rows}
+
+
+def test_refresh_rolls_only_days_after_the_watermark(database, owner_id):
+    add_submissions(database, owner_id, datetime(2026, 5, 1, 9), datetime(2026, 5, 1, 23, 59), datetime(2026, 5, 2, 0))
+
+    with database.SessionLocal() as db:
+        assert database.refresh_daily_rollups(db, through=date(2026, 5, 1)) == date(2026, 5, 1)
+    assert created_counts(database) == {date(2026, 5, 1): 2}
+
+    # A late row on a day that is already rolled stays out until a rebuild.
+    add_submissions(database, owner_id, datetime(2026, 5, 1, 12), datetime(2026, 5, 3, 8))
+    with database.SessionLocal() as db:
+        assert database.refresh_daily_rollups(db, through=date(2026, 5, 3)) == date(2026, 5, 3)
+    assert created_counts(database) == {date(2026, 5, 1): 2, date(2026, 5, 2): 1, date(2026, 5, 3): 1}
+
+    with database.SessionLocal() as db:
+        assert database.refresh_daily_rollups(db, through=date(2026, 5, 2)) == date(2026, 5, 3)
+        assert db.get(app.RollupWatermark, "daily").rolled_through == date(2026, 5, 3)
+
+
+def test_refresh_leaves_today_out(database, owner_id):
+    today = datetime.utcnow().date()
+    add_submissions(database, owner_id, day_at_noon(today - timedelta(days=1)), day_at_noon(today))
+
+    with database.SessionLocal() as db:
+        assert database.refresh_daily_rollups(db) == today - timedelta(days=1)
+    assert created_counts(database) == {today - timedelta(days=1): 1}
+
+
+def test_rebuild_recounts_rolled_days(database, owner_id):
+    add_submissions(database, owner_id, datetime(2026, 5, 1, 9))
+    with database.SessionLocal() as db:
+        database.refresh_daily_rollups(db, through=date(2026, 5, 1))
+    add_submissions(database, owner_id, datetime(2026, 5, 1, 10))
+
+    with database.SessionLocal() as db:
+        database.rebuild_daily_rollups(db)
+
+    assert created_counts(database)[date(2026, 5, 1)] == 2
+
+
+def test_decisions_are_rolled_by_actor_and_bucket(database, owner_id, create_user):
+    with database.SessionLocal() as db:
+        admin = create_user(db, app.RoleEnum.ADMIN_RW)
+        submission = app.Submission(
+            user_id=owner_id,
+            type="Surat Pengantar KTP",
+            payload={},
+            status=app.SubmissionStatusEnum.APPROVED,
+            created_at=datetime(2026, 5, 1, 8),
+        )
+        db.add(submission)
+        db.flush()
+        db.add(
+            app.ApprovalLog(
+                submission_id=submission.id,
+                actor_user_id=admin.id,
+                action=app.SubmissionActionEnum.APPROVE,
+                created_at=datetime(2026, 5, 1, 9, 30),
+            )
+        )
+        db.commit()
+        admin_id = admin.id
+
+        database.refresh_daily_rollups(db, through=date(2026, 5, 1))
+        rows = {
+            (row.metric, row.dimension): row.value
+            for row in db.scalars(app.select(app.DailyRollup).where(app.DailyRollup.day == date(2026, 5, 1)))
+        }
+
+    assert rows[("approvals", str(admin_id))] == 1
+    assert rows[("decision_seconds", "")] == 5400
+    assert sum(value for (metric, _), value in rows.items() if metric == "decision_hours") == 1
@@ -0,0 +1,61 @@
+from datetime import datetime
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def published(database, create_user, auth_headers):
+    with database.SessionLocal() as db:
+        warga = create_user(db, full_name="Siti Nurhaliza éè \U0001f600")
+        admin = create_user(db, app.RoleEnum.ADMIN_RW)
+        db.add(
+            app.Submission(
+                user_id=warga.id,
+                type="Surat Keterangan Domisili",
+                payload={"catatan": "Rumah di gang “Melati”", "anggota": [1, 2.5, None, True]},
+                status=app.SubmissionStatusEnum.IN_REVIEW,
+                created_at=datetime(2026, 5, 1, 8, 30, 15, 123456),
+                updated_at=datetime(2026, 5, 1, 9, 0, 0, 1),
+            )
+        )
+        for index, status in enumerate([app.AnnouncementStatusEnum.PUBLISHED, app.AnnouncementStatusEnum.DRAFT]):
+            db.add(
+                app.Announcement(
+                    slug=f"kerja-bakti-{index}",
+                    title="Kerja bakti – RT 03 </script>",
+                    excerpt="Bawa cangkul & sapu \U0001f9f9",
+                    category="Kegiatan",
+                    content="Baris satu\nBaris \"dua\"",
+                    status=status,
+                    author_user_id=admin.id,
+                    published_at=datetime(2026, 5, 2, 7, 0, 0, 654321) if index == 0 else None,
+                    created_at=datetime(2026, 5, 1, 7, 0, 0, 5),
+                    updated_at=datetime(2026, 5, 1, 7, 0, 0, 5),
+                )
+            )
+        db.commit()
+        return auth_headers(admin)
+
+
+@pytest.mark.parametrize(
+    "path, admin",
+    [
+        ("/api/admin/submissions", True),
+        ("/api/admin/announcements", True),
+        ("/api/announcements", False),
+        ("/api/announcements/kerja-bakti-0", False),
+    ],
+)
+def test_encoders_produce_identical_bytes(client, database, monkeypatch, published, path, admin):
+    bodies = {}
+    for encoder in ("stdlib", "orjson"):
+        monkeypatch.setattr(app, "JSON_ENCODER", encoder)
+        database.invalidate_public_cache()
+        response = client.get(path, headers=published if admin else {})
+        assert response.status_code == 200, response.text
+        bodies[encoder] = response.content
+
+    assert bodies["orjson"] == bodies["stdlib"]
+    assert b"kerja-bakti" in bodies["stdlib"] or b"Surat Keterangan Domisili" in bodies["stdlib"]
@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def detail_submission(database, create_user, auth_headers):
+    with database.SessionLocal() as db:
+        warga = create_user(db, app.RoleEnum.WARGA)
+        admin = create_user(db, app.RoleEnum.ADMIN_RW)
+        submission = app.Submission(
+            user_id=warga.id,
+            type="Surat Pengantar KTP",
+            payload={"note": "Perpanjangan KTP", "checklist": ["Fotokopi KK"]},
+            status=app.SubmissionStatusEnum.IN_REVIEW,
+        )
+        db.add(submission)
+        db.flush()
+        for index in range(2):
+            db.add(
+                app.SubmissionFile(
+                    submission_id=submission.id,
+                    document_type="KK",
+                    original_name=f"kk-{index}.pdf",
+                    stored_name=f"{uuid4().hex}.pdf",
+                    mime_type="application/pdf",
+                    size_bytes=1024,
+                )
+            )
+        now = datetime.utcnow()
+        actions = [app.SubmissionActionEnum.REQUEST_REVISION, app.SubmissionActionEnum.SET_IN_REVIEW]
+        for offset, action in enumerate(actions):
+            db.add(
+                app.ApprovalLog(
+                    submission_id=submission.id,
+                    actor_user_id=admin.id,
+                    action=action,
+                    created_at=now + timedelta(seconds=offset),
+                )
+            )
+        db.commit()
+        # Authentication is served from the principal cache, so the counts below are the endpoint's own.
+        app.cache_principal(warga)
+        app.cache_principal(admin)
+        return {
+            "id": submission.id,
+            "warga": auth_headers(warga),
+            "admin": auth_headers(admin),
+        }
+
+
+def test_warga_detail_round_trips(client, count_queries, detail_submission):
+    with count_queries() as statements:
+        response = client.get(f"/api/submissions/{detail_submission['id']}", headers=detail_submission["warga"])
+
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["files"]) == 2
+    assert body["last_action"]["action"] == "SET_IN_REVIEW"
+    # Submission with files joined, then logs in one selectin query.
+    assert len(statements) == 2, statements
+
+
+def test_admin_detail_round_trips(client, count_queries, detail_submission):
+    with count_queries() as statements:
+        response = client.get(f"/api/admin/submissions/{detail_submission['id']}", headers=detail_submission["admin"])
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["owner_full_name"] == "Budi Santoso"
+    assert len(body["files"]) == 2
+    assert [log["action"] for log in body["logs"]] == ["SET_IN_REVIEW", "REQUEST_REVISION"]
+    # Submission with owner and files joined, then logs in one selectin query.
+    assert len(statements) == 2, statements
@@ -0,0 +1,66 @@
+import app
+
+
+def stats(client, headers):
+    response = client.get("/api/admin/submissions/stats", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_create_and_actions_keep_counters_in_step(client, database, create_user, auth_headers):
+    with database.SessionLocal() as db:
+        warga = create_user(db)
+        admin = create_user(db, app.RoleEnum.ADMIN_RW)
+        db.commit()
+        warga_headers, admin_headers = auth_headers(warga), auth_headers(admin)
+
+    created = [
+        client.post("/api/submissions", json={"type": kind, "payload": {}}, headers=warga_headers).json()
+        for kind in ["Surat Pengantar KTP", "Surat Pengantar KTP", "Surat Pengantar KK"]
+    ]
+    response = client.post(
+        f"/api/submissions/{created[0]['id']}/actions", json={"action": "REJECT"}, headers=admin_headers
+    )
+    assert response.status_code == 200, response.text
+
+    body = stats(client, admin_headers)
+    assert body["total"] == 3
+    assert body["by_status"]["SUBMITTED"] == 2
+    assert body["by_status"]["REJECTED"] == 1
+    assert body["by_type"]["Surat Pengantar KTP"]["REJECTED"] == 1
+    assert body["by_type"]["Surat Pengantar KK"]["SUBMITTED"] == 1
+
+
+def test_reconcile_reports_and_repairs_drift(client, database, create_user, auth_headers):
+    with database.SessionLocal() as db:
+        warga = create_user(db)
+        admin = create_user(db, app.RoleEnum.ADMIN_RW)
+        db.add_all(
+            [
+                app.Submission(user_id=warga.id, type="Surat Pengantar KTP", payload={}, status=status)
+                for status in [app.SubmissionStatusEnum.SUBMITTED, app.SubmissionStatusEnum.APPROVED]
+            ]
+        )
+        # One stale row for a type that no longer exists and one count that is off.
+        db.add(app.SubmissionCounter(type="Surat Pengantar KTP", status=app.SubmissionStatusEnum.SUBMITTED, count=5))
+        db.add(app.SubmissionCounter(type="Surat Lama", status=app.SubmissionStatusEnum.REJECTED, count=2))
+        db.commit()
+        headers = auth_headers(admin)
+
+    response = client.post("/api/admin/submissions/stats/reconcile", headers=headers)
+
+    assert response.status_code == 200, response.text
+    assert response.json() == {
+        "rows": 2,
+        "drift": [
+            {"type": "Surat Lama", "status": "REJECTED", "stored": 2, "actual": 0},
+            {"type": "Surat Pengantar KTP", "status": "APPROVED", "stored": 0, "actual": 1},
+            {"type": "Surat Pengantar KTP", "status": "SUBMITTED", "stored": 5, "actual": 1},
+        ],
+    }
+    body = stats(client, headers)
+    assert body["total"] == 2
+    assert set(body["by_type"]) == {"Surat Pengantar KTP"}
+
+    with database.SessionLocal() as db:
+        assert database.reconcile_submission_counters(db)["drift"] == []
@@ -0,0 +1,226 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import logging
+import os
+import random
+import signal
+import socket
+import threading
+import time
+import traceback
+from typing import Any, NamedTuple
+import zlib
+
+from sqlalchemy import func, select, update
+
+from app import (
+    Job,
+    JobStatusEnum,
+    SessionLocal,
+    job_handlers,
+    maintain_approval_log_partitions,
+    reconcile_submission_counters,
+)
+
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1"))
+JOB_RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", "10"))
+JOB_RETRY_MAX_SECONDS = float(os.getenv("JOB_RETRY_MAX_SECONDS", "3600"))
+JOB_LOCK_TIMEOUT_SECONDS = float(os.getenv("JOB_LOCK_TIMEOUT_SECONDS", "600"))
+JOB_RETENTION_DAYS = int(os.getenv("JOB_RETENTION_DAYS", "7"))
+MAINTENANCE_INTERVAL_SECONDS = 60
+PARTITION_MAINTENANCE_INTERVAL_SECONDS = 3600
+COUNTER_RECONCILE_INTERVAL_SECONDS = 3600
+JOB_CLAIM_LOCK_ID = 814002
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+logger = logging.getLogger("worker")
+
+
+class ClaimedJob(NamedTuple):
+    id: int
+    kind: str
+    payload: dict[str, Any]
+    attempts: int
+    max_attempts: int
+
+
+def retry_delay(attempts: int) -> float:
+    delay = min(JOB_RETRY_MAX_SECONDS, JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def claim_jobs(kind: str, limit: int) -> list[ClaimedJob]:
+    # The per-kind advisory lock makes the concurrency limit hold across every worker process.
+    with SessionLocal() as db:
+        db.execute(select(func.pg_advisory_xact_lock(JOB_CLAIM_LOCK_ID, zlib.crc32(kind.encode()) & 0x7FFFFFFF)))
+        running = db.scalar(select(func.count()).where(Job.kind == kind, Job.status == JobStatusEnum.RUNNING))
+        slots = min(limit, job_handlers[kind].concurrency - running)
+        if slots <= 0:
+            db.rollback()
+            return []
+
+        now = datetime.utcnow()
+        candidates = (
+            select(Job.id)
+            .where(Job.kind == kind, Job.status == JobStatusEnum.QUEUED, Job.run_at <= now)
+            .order_by(Job.run_at, Job.id)
+            .limit(slots)
+            .with_for_update(skip_locked=True)
+        )
+        rows = db.execute(
+            update(Job)
+            .where(Job.id.in_(candidates.scalar_subquery()))
+            .values(status=JobStatusEnum.RUNNING, attempts=Job.attempts + 1, locked_by=WORKER_ID, started_at=now)
+            .returning(Job.id, Job.kind, Job.payload, Job.attempts, Job.max_attempts)
+            .execution_options(synchronize_session=False)
+        ).all()
+        db.commit()
+    return [ClaimedJob(*row) for row in rows]
+
+
+def finish_job(job: ClaimedJob, error: str | None = None) -> None:
+    now = datetime.utcnow()
+    if error is None:
+        values = {"status": JobStatusEnum.DONE, "finished_at": now, "locked_by": None}
+    elif job.attempts >= job.max_attempts:
+        values = {"status": JobStatusEnum.FAILED, "finished_at": now, "locked_by": None, "last_error": error}
+    else:
+        values = {
+            "status": JobStatusEnum.QUEUED,
+            "run_at": now + timedelta(seconds=retry_delay(job.attempts)),
+            "locked_by": None,
+            "last_error": error,
+        }
+    with SessionLocal() as db:
+        db.execute(
+            update(Job)
+            .where(Job.id == job.id, Job.status == JobStatusEnum.RUNNING)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+
+def run_job(job: ClaimedJob) -> None:
+    started = time.monotonic()
+    try:
+        with SessionLocal() as db:
+            job_handlers[job.kind].fn(db, job.payload)
+    except Exception:
+        logger.exception("job %s (%s) failed on attempt %s/%s", job.id, job.kind, job.attempts, job.max_attempts)
+        finish_job(job, traceback.format_exc(limit=5))
+        return
+    finish_job(job)
+    logger.info("job %s (%s) done in %.3fs", job.id, job.kind, time.monotonic() - started)
+
+
+def requeue_stale_jobs() -> None:
+    # Jobs left RUNNING by a crashed or killed worker go back to the queue (or fail when out of attempts).
+    cutoff = datetime.utcnow() - timedelta(seconds=JOB_LOCK_TIMEOUT_SECONDS)
+    stale = (Job.status == JobStatusEnum.RUNNING, Job.started_at < cutoff)
+    with SessionLocal() as db:
+        db.execute(
+            update(Job)
+            .where(*stale, Job.attempts >= Job.max_attempts)
+            .values(status=JobStatusEnum.FAILED, finished_at=datetime.utcnow(), last_error="Lock timed out")
+            .execution_options(synchronize_session=False)
+        )
+        db.execute(
+            update(Job)
+            .where(*stale)
+            .values(status=JobStatusEnum.QUEUED, run_at=datetime.utcnow(), locked_by=None, last_error="Lock timed out")
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+
+def purge_finished_jobs() -> None:
+    cutoff = datetime.utcnow() - timedelta(days=JOB_RETENTION_DAYS)
+    with SessionLocal() as db:
+        db.execute(
+            Job.__table__.delete().where(
+                Job.status.in_([JobStatusEnum.DONE, JobStatusEnum.FAILED]), Job.finished_at < cutoff
+            )
+        )
+        db.commit()
+
+
+def maintain_partitions() -> None:
+    try:
+        with SessionLocal() as db:
+            result = maintain_approval_log_partitions(db)
+    except Exception:
+        logger.exception("approval log partition maintenance failed")
+        return
+    for name in result["created"]:
+        logger.info("created partition %s", name)
+    for item in result["archived"]:
+        logger.info("archived %s (%s rows) to %s", item["partition"], item["rows"], item["archive"])
+
+
+def reconcile_counters() -> None:
+    try:
+        with SessionLocal() as db:
+            result = reconcile_submission_counters(db)
+    except Exception:
+        logger.exception("submission counter reconciliation failed")
+        return
+    for item in result["drift"]:
+        logger.warning(
+            "corrected counter %s/%s: stored %s, actual %s",
+            item["type"],
+            item["status"].value,
+            item["stored"],
+            item["actual"],
+        )
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopping.set())
+    signal.signal(signal.SIGINT, lambda *_: stopping.set())
+
+    executor = ThreadPoolExecutor(max_workers=sum(handler.concurrency for handler in job_handlers.values()))
+    in_flight = {kind: 0 for kind in job_handlers}
+    in_flight_lock = threading.Lock()
+
+    def release(kind: str) -> None:
+        with in_flight_lock:
+            in_flight[kind] -= 1
+
+    logger.info("worker %s started for %s", WORKER_ID, ", ".join(sorted(job_handlers)))
+    next_maintenance = 0.0
+    next_partition_maintenance = 0.0
+    next_counter_reconcile = 0.0
+    while not stopping.is_set():
+        if time.monotonic() >= next_maintenance:
+            requeue_stale_jobs()
+            purge_finished_jobs()
+            next_maintenance = time.monotonic() + MAINTENANCE_INTERVAL_SECONDS
+        if time.monotonic() >= next_partition_maintenance:
+            maintain_partitions()
+            next_partition_maintenance = time.monotonic() + PARTITION_MAINTENANCE_INTERVAL_SECONDS
+        if time.monotonic() >= next_counter_reconcile:
+            reconcile_counters()
+            next_counter_reconcile = time.monotonic() + COUNTER_RECONCILE_INTERVAL_SECONDS
+
+        claimed = 0
+        for kind, handler in job_handlers.items():
+            with in_flight_lock:
+                free = handler.concurrency - in_flight[kind]
+            if free <= 0:
+                continue
+            for job in claim_jobs(kind, free):
+                with in_flight_lock:
+                    in_flight[kind] += 1
+                executor.submit(run_job, job).add_done_callback(lambda _, kind=kind: release(kind))
+                claimed += 1
+        stopping.wait(0 if claimed else JOB_POLL_SECONDS)
+
+    logger.info("worker %s stopping, waiting for running jobs", WORKER_ID)
+    executor.shutdown(wait=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -52,6 +52,7 @@ const emptyAnnouncementDraft = {
   content: "# Judul Pengumuman\nIsi detail pengumuman di sini.",
   status: "DRAFT",
   coverUrl: "",
+  coverUrls: null,
   coverName: "",
   coverFocus: "center",
   publishedAt: null,
@@ -76,6 +77,17 @@ const REQUIREMENTS_BY_TYPE = {
 
 const normalizeDocType = (value) => (value || "").trim().toLowerCase();
 
+// Widths of the cover derivatives rendered by the backend (COVER_VARIANTS).
+const COVER_WIDTHS = { thumb: 320, card: 640, full: 1280 };
+
+const coverSrcSet = (coverUrls) =>
+  coverUrls
+    ? Object.entries(COVER_WIDTHS)
+        .filter(([size]) => coverUrls[size])
+        .map(([size, width]) => `${coverUrls[size]} ${width}w`)
+        .join(", ")
+    : undefined;
+
 function parseHash() {
   const hash = window.location.hash.replace("#", "");
   if (!hash || hash === "/") {
@@ -139,10 +151,12 @@ function App() {
 
   const [submissions, setSubmissions] = useState([]);
   const [adminSubmissions, setAdminSubmissions] = useState([]);
+  const [adminNextCursor, setAdminNextCursor] = useState(null);
   const [submissionDetail, setSubmissionDetail] = useState(null);
   const [adminDetail, setAdminDetail] = useState(null);
   const [isLoadingSubmissions, setIsLoadingSubmissions] = useState(false);
   const [isLoadingAdminSubmissions, setIsLoadingAdminSubmissions] = useState(false);
+  const [isLoadingMoreAdminSubmissions, setIsLoadingMoreAdminSubmissions] = useState(false);
   const [isLoadingSubmissionDetail, setIsLoadingSubmissionDetail] = useState(false);
   const [isLoadingAdminDetail, setIsLoadingAdminDetail] = useState(false);
 
@@ -186,6 +200,7 @@ function App() {
     content: item.content || "",
     status: item.status,
     coverUrl: item.cover_url || "",
+    coverUrls: item.cover_urls || null,
     coverName: item.cover_name || "",
     coverFocus: item.cover_focus || "center",
     publishedAt: item.published_at || null,
@@ -361,6 +376,26 @@ function App() {
     });
   };
 
+  // The admin list is paged by the API; a cursor appends the next page to the rows already shown.
+  const loadAdminSubmissions = (cursor = null) => {
+    const setLoading = cursor ? setIsLoadingMoreAdminSubmissions : setIsLoadingAdminSubmissions;
+    setLoading(true);
+    const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+    fetchWithAuth(`/api/admin/submissions${query}`)
+      .then((res) => {
+        if (!res.ok) {
+          throw new Error(`HTTP ${res.status}`);
+        }
+        return res.json();
+      })
+      .then((data) => {
+        setAdminSubmissions((prev) => (cursor ? [...prev, ...data.items] : data.items));
+        setAdminNextCursor(data.next_cursor || null);
+      })
+      .finally(() => setLoading(false))
+      .catch((err) => setAuthError(err.message || "failed to load admin list"));
+  };
+
   useEffect(() => {
     if (!token || !me) {
       return;
@@ -368,17 +403,7 @@ function App() {
 
     if (route.name === "dashboard") {
       if (isAdmin) {
-        setIsLoadingAdminSubmissions(true);
-        fetchWithAuth("/api/admin/submissions")
-          .then((res) => {
-            if (!res.ok) {
-              throw new Error(`HTTP ${res.status}`);
-            }
-            return res.json();
-          })
-          .then((data) => setAdminSubmissions(data))
-          .finally(() => setIsLoadingAdminSubmissions(false))
-          .catch((err) => setAuthError(err.message || "failed to load admin list"));
+        loadAdminSubmissions();
       } else {
         setIsLoadingSubmissions(true);
         fetchWithAuth("/api/submissions")
@@ -395,17 +420,7 @@ function App() {
     }
 
     if (route.name === "admin-list" && isAdmin) {
-      setIsLoadingAdminSubmissions(true);
-      fetchWithAuth("/api/admin/submissions")
-        .then((res) => {
-          if (!res.ok) {
-            throw new Error(`HTTP ${res.status}`);
-          }
-          return res.json();
-        })
-        .then((data) => setAdminSubmissions(data))
-        .finally(() => setIsLoadingAdminSubmissions(false))
-        .catch((err) => setAuthError(err.message || "failed to load admin list"));
+      loadAdminSubmissions();
     }
 
     if (route.name === "submission-detail") {
@@ -1436,6 +1451,13 @@ function App() {
             </button>
           ))
         )}
+        {!isLoadingAdminSubmissions && adminNextCursor ? (
+          <div className="flex justify-center pt-2">
+            <GhostButton onClick={() => !isLoadingMoreAdminSubmissions && loadAdminSubmissions(adminNextCursor)}>
+              {isLoadingMoreAdminSubmissions ? "Memuat..." : "Muat lebih banyak"}
+            </GhostButton>
+          </div>
+        ) : null}
       </div>
     </section>
   );
@@ -1600,7 +1622,7 @@ function App() {
               style={
                 item.coverUrl
                   ? {
-                      backgroundImage: `url(${item.coverUrl})`,
+                      backgroundImage: `url(${item.coverUrls?.card || item.coverUrl})`,
                       backgroundSize: "cover",
                       backgroundPosition: item.coverFocus || "center"
                     }
@@ -1654,7 +1676,9 @@ function App() {
             <div className="overflow-hidden rounded-2xl border border-border">
               <img
                 className="h-56 w-full object-cover"
-                src={currentAnnouncement.coverUrl}
+                src={currentAnnouncement.coverUrls?.full || currentAnnouncement.coverUrl}
+                srcSet={coverSrcSet(currentAnnouncement.coverUrls)}
+                sizes="(min-width: 1024px) 768px, 100vw"
                 alt={currentAnnouncement.coverName || currentAnnouncement.title}
                 style={{ objectPosition: currentAnnouncement.coverFocus || "center" }}
               />
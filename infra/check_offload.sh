@@ -0,0 +1,73 @@
+#!/bin/sh
+# End-to-end check of FILE_OFFLOAD=nginx on the production stack.
+# Run from the repository root after `docker compose -f docker-compose.prod.yml up -d`:
+#
+#   sh infra/check_offload.sh
+#
+# 1. every stored file on the uploads volume must be readable by the nginx user;
+# 2. a published announcement cover must come back through X-Accel-Redirect with 200;
+# 3. nginx must send the API's ETag and Last-Modified, so If-None-Match and If-Range
+#    behave as they do with FILE_OFFLOAD=off.
+set -eu
+
+COMPOSE="docker compose -f docker-compose.prod.yml"
+BASE_URL="${BASE_URL:-http://localhost:8080}"
+failed=0
+
+unreadable=$($COMPOSE exec -T -u nginx web find /app/uploads -type f ! -name '*.part' \
+  -exec sh -c 'for f; do [ -r "$f" ] || echo "$f"; done' sh {} +)
+if [ -n "$unreadable" ]; then
+  echo "FAIL: files nginx cannot read (fix with: $COMPOSE exec backend chmod -R a+rX /app/uploads):"
+  echo "$unreadable"
+  failed=1
+else
+  echo "ok: all stored files are readable by nginx"
+fi
+
+cover_url=$(curl -fsS "$BASE_URL/api/announcements" | grep -o '"cover_url":"[^"]*"' | head -n 1 | cut -d '"' -f 4)
+if [ -z "$cover_url" ]; then
+  echo "skip: no published announcement with a cover to fetch"
+else
+  status=$(curl -s -o /dev/null -w '%{http_code}' "$BASE_URL$cover_url")
+  if [ "$status" = "200" ]; then
+    echo "ok: $cover_url served through nginx"
+  else
+    echo "FAIL: $cover_url returned HTTP $status"
+    failed=1
+  fi
+
+  # Validators as the API computes them: ask the backend directly, bypassing nginx.
+  api_headers=$($COMPOSE exec -T backend python -c "
+import sys, urllib.request
+headers = urllib.request.urlopen('http://localhost:8000' + sys.argv[1]).headers
+print(headers['ETag']); print(headers['Last-Modified'])" "$cover_url")
+  api_etag=$(echo "$api_headers" | sed -n 1p)
+  api_last_modified=$(echo "$api_headers" | sed -n 2p)
+  nginx_headers=$(curl -fsS -o /dev/null -D - "$BASE_URL$cover_url" | tr -d '\r')
+  nginx_etag=$(echo "$nginx_headers" | sed -n 's/^[Ee][Tt][Aa][Gg]: //p')
+  nginx_last_modified=$(echo "$nginx_headers" | sed -n 's/^[Ll]ast-[Mm]odified: //p')
+  if [ -n "$api_etag" ] && [ "$nginx_etag" = "$api_etag" ] && [ "$nginx_last_modified" = "$api_last_modified" ]; then
+    echo "ok: nginx sends the API validators ($api_etag, $api_last_modified)"
+  else
+    echo "FAIL: validators differ: API $api_etag / $api_last_modified, nginx $nginx_etag / $nginx_last_modified"
+    failed=1
+  fi
+
+  status=$(curl -s -o /dev/null -w '%{http_code}' -H "If-None-Match: $api_etag" "$BASE_URL$cover_url")
+  if [ "$status" = "304" ]; then
+    echo "ok: If-None-Match with the API ETag returns 304"
+  else
+    echo "FAIL: If-None-Match with the API ETag returned HTTP $status"
+    failed=1
+  fi
+
+  status=$(curl -s -o /dev/null -w '%{http_code}' -H "Range: bytes=0-9" -H "If-Range: $api_etag" "$BASE_URL$cover_url")
+  if [ "$status" = "206" ]; then
+    echo "ok: If-Range with the API ETag returns 206"
+  else
+    echo "FAIL: If-Range with the API ETag returned HTTP $status"
+    failed=1
+  fi
+fi
+
+exit "$failed"